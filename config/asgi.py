@@ -11,6 +11,14 @@ import os
 
 from django.core.asgi import get_asgi_application
 
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mutadi.settings')
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from mutadi.pages.warmup import warm_up  # noqa: E402 isort:skip
+from mutadi.realtime.asgi import RealtimeRouter  # noqa: E402 isort:skip
+
+application = RealtimeRouter(django_application)
+
+# Server workers import this module before accepting any request
+warm_up()
@@ -0,0 +1,87 @@
+"""
+Gunicorn configuration for mutadi project.
+
+Every setting can be overridden from the environment, so that the same
+module serves Heroku dynos of every size and local load tests:
+
+    GUNICORN_WORKER_CLASS  uvicorn.workers.UvicornWorker (default, ASGI,
+                           needed by the realtime events), gthread or
+                           sync (WSGI, no realtime events)
+    WEB_CONCURRENCY        worker processes
+    GUNICORN_THREADS       threads of each gthread worker
+    GUNICORN_PRELOAD       load the application once in the master
+    GUNICORN_MAX_REQUESTS  requests before a worker is recycled, with
+                           GUNICORN_MAX_REQUESTS_JITTER spreading restarts
+    GUNICORN_KEEPALIVE     seconds an idle client connection stays open
+    GUNICORN_BACKLOG       pending connections queued by the kernel
+    GUNICORN_TIMEOUT       seconds a silent worker lives before a restart
+
+For more information on this file, see
+https://docs.gunicorn.org/en/stable/settings.html
+"""
+import multiprocessing
+import os
+
+
+def env_int(name, default):
+    return int(os.environ.get(name, default))
+
+
+def env_bool(name, default):
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.lower() in ("1", "true", "yes", "on")
+
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+
+worker_class = os.environ.get(
+    "GUNICORN_WORKER_CLASS", "uvicorn.workers.UvicornWorker"
+)
+# Async workers serve the ASGI application, others the WSGI one
+if "uvicorn" in worker_class:
+    wsgi_app = "config.asgi:application"
+else:
+    wsgi_app = "config.wsgi:application"
+
+workers = env_int("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1)
+threads = env_int("GUNICORN_THREADS", 4 if worker_class == "gthread" else 1)
+
+# Templates and urls are warmed up once in the master and shared by the
+# forked workers, see config.asgi
+preload_app = env_bool("GUNICORN_PRELOAD", True)
+
+# Recycling workers bounds the growth of their memory, the jitter keeps
+# them from restarting all at once
+max_requests = env_int("GUNICORN_MAX_REQUESTS", 1000)
+max_requests_jitter = env_int("GUNICORN_MAX_REQUESTS_JITTER", 100)
+
+keepalive = env_int("GUNICORN_KEEPALIVE", 5)
+backlog = env_int("GUNICORN_BACKLOG", 2048)
+timeout = env_int("GUNICORN_TIMEOUT", 30)
+graceful_timeout = env_int("GUNICORN_GRACEFUL_TIMEOUT", 30)
+
+accesslog = "-"
+errorlog = "-"
+
+
+def when_ready(server):
+    """
+    Close the database connections the master may have opened while
+    preloading, so that no worker inherits them.
+    """
+    if preload_app:
+        from django.db import connections
+        from mutadi.db.pool import close_pools
+
+        connections.close_all()
+        close_pools()
+
+
+def post_fork(server, worker):
+    """Start every worker without any database connection."""
+    if preload_app:
+        from django.db import connections
+
+        connections.close_all()
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/3.1/ref/settings/
 """
 import os
+import tempfile
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -31,6 +32,8 @@ INSTALLED_APPS = [
     "mutadi.posts",
     "mutadi.members",
     "mutadi.private_messages",
+    "mutadi.images",
+    "mutadi.realtime",
     "ckeditor",
     "storages",
 ]
@@ -39,6 +42,8 @@ SITE_ID = 1
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "mutadi.pages.cache.PageCacheMiddleware",
+    "mutadi.db.replicas.ReplicaMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -53,19 +58,77 @@ TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
         "DIRS": [os.path.join(APPS_DIR, "templates")],
-        "APP_DIRS": True,
         "OPTIONS": {
             "context_processors": [
                 "django.template.context_processors.debug",
                 "django.template.context_processors.request",
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
+                "mutadi.private_messages.context_processors.unread_messages",
+            ],
+            # Templates are parsed once per process, see
+            # mutadi.pages.warmup; local.py reloads them in debug mode.
+            "loaders": [
+                (
+                    "django.template.loaders.cached.Loader",
+                    [
+                        "django.template.loaders.filesystem.Loader",
+                        "django.template.loaders.app_directories.Loader",
+                    ],
+                ),
             ],
         },
     },
 ]
 
 WSGI_APPLICATION = "config.wsgi.application"
+ASGI_APPLICATION = "config.asgi.application"
+
+
+# Caches
+# https://docs.djangoproject.com/en/3.1/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "mutadi",
+    }
+}
+
+# Seconds the pages of anonymous visitors stay cached, unless they change
+PAGE_CACHE_TIMEOUT = int(os.environ.get("PAGE_CACHE_TIMEOUT", 60 * 5))
+
+
+# Database connections
+# With the mutadi.db backend, connections persist between requests and
+# are checked before reuse. Threaded workers may borrow them from a pool
+# of DATABASE_POOL_MAX_SIZE connections instead.
+DATABASE_CONN_MAX_AGE = int(os.environ.get("DATABASE_CONN_MAX_AGE", 60))
+DATABASE_OPTIONS = {}
+if os.environ.get("DATABASE_POOL_MAX_SIZE"):
+    DATABASE_CONN_MAX_AGE = 0
+    DATABASE_OPTIONS["pool"] = {
+        "max_size": int(os.environ["DATABASE_POOL_MAX_SIZE"]),
+        "timeout": float(os.environ.get("DATABASE_POOL_TIMEOUT", 10)),
+    }
+
+# Read replicas, as database urls separated by spaces, see
+# mutadi.db.replicas. Writers read from the primary for a while after.
+DATABASE_REPLICA_URLS = os.environ.get("DATABASE_REPLICA_URLS", "").split()
+DATABASE_REPLICAS = []
+DATABASE_REPLICA_PIN_SECONDS = int(
+    os.environ.get("DATABASE_REPLICA_PIN_SECONDS", 15)
+)
+DATABASE_ROUTERS = ["mutadi.db.replicas.ReplicaRouter"]
+
+
+# Realtime events reach the clients connected to the same process only
+CHANNEL_LAYERS = {
+    "default": {
+        "BACKEND": "mutadi.realtime.layers.InMemoryChannelLayer",
+        "CONFIG": {"capacity": 100},
+    }
+}
 
 
 # SECURITY
@@ -138,4 +201,22 @@ AWS_S3_SIGNATURE_VERSION = os.environ["AWS_S3_SIGNATURE_VERSION"]
 AWS_S3_FILE_OVERWRITE = False
 AWS_DEFAULT_ACL = None
 
-DEFAULT_FILE_STORAGE = "storages.backends.s3boto3.S3Boto3Storage"
+# Public CDN domain of the bucket: its urls are served unsigned
+AWS_S3_CUSTOM_DOMAIN = os.environ.get("AWS_S3_CUSTOM_DOMAIN")
+AWS_QUERYSTRING_AUTH = not AWS_S3_CUSTOM_DOMAIN
+# Number of signed urls memoized by the media storage
+AWS_S3_URL_CACHE_SIZE = int(os.environ.get("AWS_S3_URL_CACHE_SIZE", 1024))
+
+DEFAULT_FILE_STORAGE = "mutadi.images.storage.CachedS3Storage"
+
+# Uploaded images wait on local disk until an image worker processes them
+IMAGE_STAGING_ROOT = os.environ.get(
+    "IMAGE_STAGING_ROOT", os.path.join(tempfile.gettempdir(), "mutadi-uploads")
+)
+# In-process image workers, 0 leaves the queue to manage.py process_images
+IMAGE_TASK_THREADS = int(os.environ.get("IMAGE_TASK_THREADS", 2))
+
+# Days a message deleted by both users is kept before manage.py purge_messages
+PRIVATE_MESSAGES_RETENTION_DAYS = int(
+    os.environ.get("PRIVATE_MESSAGES_RETENTION_DAYS", 30)
+)
@@ -11,13 +11,22 @@ https://docs.djangoproject.com/en/3.1/ref/settings/
 """
 import os
 
+from mutadi.db.replicas import replica_databases
+
 from .base import *
 
 # SECURITY WARNING: keep the secret key used in production secret!
 SECRET_KEY = os.environ["DJANGO_SECRET_KEY"]
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = os.environ["DJANGO_DEBUG"]
+DEBUG = os.environ["DJANGO_DEBUG"].lower() in ("1", "true", "yes", "on")
+
+if DEBUG:
+    # Parse templates on every request so that edits show up at once
+    TEMPLATES[0]["OPTIONS"]["loaders"] = [  # noqa F405
+        "django.template.loaders.filesystem.Loader",
+        "django.template.loaders.app_directories.Loader",
+    ]
 
 ALLOWED_HOSTS = [os.environ["DATABASE_HOST"]]
 
@@ -32,9 +41,19 @@ DATABASES = {
         "PASSWORD": os.environ["DATABASE_PASSWORD"],
         "HOST": os.environ["DATABASE_HOST"],
         "PORT": os.environ["DATABASE_PORT"],
+        "CONN_MAX_AGE": DATABASE_CONN_MAX_AGE,  # noqa F405
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": DATABASE_OPTIONS,  # noqa F405
     }
 }
 
+# Read replicas
+replicas = replica_databases(
+    DATABASES["default"], DATABASE_REPLICA_URLS  # noqa F405
+)
+DATABASES.update(replicas)
+DATABASE_REPLICAS = list(replicas)
+
 # https://django-debug-toolbar.readthedocs.io/en/latest/installation.html#internal-ips
 INTERNAL_IPS = ["127.0.0.1"]
 
@@ -1,6 +1,7 @@
 """Configuring Django Mutadi app for Heroku"""
 import django_heroku
 import sentry_sdk
+from mutadi.db.replicas import replica_databases
 from sentry_sdk.integrations.django import DjangoIntegration
 
 from .base import *
@@ -32,3 +33,20 @@ sentry_sdk.init(
 
 # Activate Django-Heroku.
 django_heroku.settings(locals())
+
+# Replace the connection settings of Django-Heroku, add the replicas
+if DATABASES.get("default"):
+    DATABASES["default"].update(
+        ENGINE="mutadi.db",
+        CONN_MAX_AGE=DATABASE_CONN_MAX_AGE,
+        CONN_HEALTH_CHECKS=True,
+        OPTIONS={
+            **DATABASES["default"].get("OPTIONS", {}),
+            **DATABASE_OPTIONS,
+        },
+    )
+    replicas = replica_databases(
+        DATABASES["default"], DATABASE_REPLICA_URLS
+    )
+    DATABASES.update(replicas)
+    DATABASE_REPLICAS = list(replicas)
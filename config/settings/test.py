@@ -9,6 +9,8 @@ https://docs.djangoproject.com/en/3.1/topics/settings/
 For the full list of settings and their values, see
 https://docs.djangoproject.com/en/3.1/ref/settings/
 """
+from mutadi.db.replicas import replica_databases
+
 from .base import *
 
 # SECURITY WARNING: keep the secret key used in production secret!
@@ -25,5 +27,19 @@ DATABASES = {
         "PASSWORD": os.environ["DATABASE_PASSWORD"],
         "HOST": os.environ["DATABASE_HOST"],
         "PORT": os.environ["DATABASE_PORT"],
+        "CONN_MAX_AGE": DATABASE_CONN_MAX_AGE,  # noqa F405
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": DATABASE_OPTIONS,  # noqa F405
     }
 }
+
+# Read replicas
+replicas = replica_databases(
+    DATABASES["default"], DATABASE_REPLICA_URLS  # noqa F405
+)
+DATABASES.update(replicas)
+DATABASE_REPLICAS = list(replicas)
+
+# Mirror of the test database for the tests of read replicas, which
+# enable it with DATABASE_REPLICAS
+DATABASES["replica"] = {**DATABASES["default"], "TEST": {"MIRROR": "default"}}
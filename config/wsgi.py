@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 
 application = get_wsgi_application()
+
+from mutadi.pages.warmup import warm_up  # noqa: E402 isort:skip
+
+# Server workers import this module before accepting any request
+warm_up()
@@ -0,0 +1,29 @@
+"""Shared fixtures for mutadi tests"""
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Start and end every test with an empty cache."""
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def count_queries(client):
+    """
+    Fixture returning a function which gets an url with the test client
+    and returns the number of queries issued to render it.
+    """
+
+    def _count_queries(url, data=None):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, data)
+        assert response.status_code == 200
+        return len(context)
+
+    return _count_queries
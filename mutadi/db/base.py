@@ -0,0 +1,113 @@
+"""PostgreSQL backend with connection health checks and pooling"""
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.base.base import NO_DB_ALIAS
+from django.db.backends.postgresql import base
+
+from .pool import close_pools, get_pool
+
+
+def is_usable(connection):
+    """Whether a psycopg2 connection still answers."""
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+    except base.Database.Error:
+        return False
+    return True
+
+
+class DatabaseCreation(base.DatabaseCreation):
+    def _destroy_test_db(self, test_database_name, verbosity):
+        # The idle connections of the pools would prevent the drop
+        close_pools()
+        super()._destroy_test_db(test_database_name, verbosity)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    Django PostgreSQL backend with two extra settings of DATABASES:
+
+    CONN_HEALTH_CHECKS: when True, a persistent connection is checked
+    before its first use by each request, and replaced if the server
+    dropped it, instead of failing that request.
+
+    OPTIONS["pool"]: when set, e.g. {"max_size": 10, "timeout": 10},
+    connections are borrowed from a pool of the process for each request
+    instead of opened, see mutadi.db.pool. CONN_MAX_AGE must then be 0.
+    """
+
+    creation_class = DatabaseCreation
+    health_check_done = False
+    pool = None
+
+    @property
+    def health_check_enabled(self):
+        return self.settings_dict.get("CONN_HEALTH_CHECKS", False)
+
+    @property
+    def pool_options(self):
+        # Connections to the maintenance database are not worth pooling
+        if self.alias == NO_DB_ALIAS:
+            return None
+        return self.settings_dict["OPTIONS"].get("pool")
+
+    def get_connection_params(self):
+        if self.pool_options and self.settings_dict["CONN_MAX_AGE"]:
+            raise ImproperlyConfigured(
+                "Pooled connections cannot be persistent, "
+                "set CONN_MAX_AGE to 0."
+            )
+        conn_params = super().get_connection_params()
+        conn_params.pop("pool", None)
+        return conn_params
+
+    def get_new_connection(self, conn_params):
+        if not self.pool_options:
+            return super().get_new_connection(conn_params)
+        self.pool = get_pool(
+            self.alias,
+            conn_params,
+            self.pool_options,
+            check=is_usable if self.health_check_enabled else None,
+        )
+        connection = self.pool.getconn(
+            lambda: super(DatabaseWrapper, self).get_new_connection(
+                conn_params
+            )
+        )
+        # Connections taken back from the pool skip the parent method
+        self.isolation_level = self.settings_dict["OPTIONS"].get(
+            "isolation_level", connection.isolation_level
+        )
+        return connection
+
+    def connect(self):
+        super().connect()
+        self.health_check_done = True
+
+    def _close(self):
+        if self.connection is None or self.pool is None:
+            return super()._close()
+        with self.wrap_database_errors:
+            self.pool.putconn(self.connection)
+
+    def close_if_unusable_or_obsolete(self):
+        super().close_if_unusable_or_obsolete()
+        self.health_check_done = False
+
+    def close_if_health_check_failed(self):
+        """Close the connection if the server dropped it."""
+        if (
+            self.connection is None
+            or not self.health_check_enabled
+            or self.health_check_done
+            or self.in_atomic_block
+        ):
+            return
+        if not is_usable(self.connection):
+            self.close()
+        self.health_check_done = True
+
+    def _cursor(self, name=None):
+        self.close_if_health_check_failed()
+        return super()._cursor(name)
@@ -0,0 +1,143 @@
+"""In-process pool of PostgreSQL connections"""
+import os
+import threading
+import time
+
+import psycopg2
+from psycopg2 import extensions
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class PoolTimeout(psycopg2.OperationalError):
+    """No connection of the pool was released in time."""
+
+
+class ConnectionPool:
+    """
+    Connections shared by the threads of a process: at most max_size of
+    them are open, the threads asking for more wait up to timeout seconds
+    for one to be released. Counters of the pool are kept for monitoring,
+    see stats.
+    """
+
+    def __init__(self, max_size=10, timeout=10, check=None):
+        self.max_size = max_size
+        self.timeout = timeout
+        self.check = check
+        self.size = 0
+        self.idle = []
+        self.checkouts = 0
+        self.waits = 0
+        self.wait_time = 0.0
+        self.timeouts = 0
+        self.condition = threading.Condition()
+
+    def getconn(self, connect):
+        """
+        Returns an idle connection, or a new one made by connect while
+        the pool is not full, waiting for one to be released otherwise.
+        Idle connections failing check are replaced.
+        """
+        start = time.monotonic()
+        with self.condition:
+            waited = False
+            while not self.idle and self.size >= self.max_size:
+                waited = True
+                remaining = self.timeout - (time.monotonic() - start)
+                if remaining <= 0 or not self.condition.wait(remaining):
+                    self.timeouts += 1
+                    raise PoolTimeout(
+                        f"No connection released within {self.timeout}s"
+                    )
+            self.checkouts += 1
+            self.waits += waited
+            self.wait_time += time.monotonic() - start
+            connection = self.idle.pop() if self.idle else None
+            self.size += connection is None
+        if connection is not None:
+            if self.check is None or self.check(connection):
+                return connection
+            connection.close()
+        try:
+            return connect()
+        except Exception:
+            self.discard()
+            raise
+
+    def putconn(self, connection):
+        """Give back a connection, rolled back if in a transaction."""
+        if not connection.closed:
+            status = connection.info.transaction_status
+            if status != extensions.TRANSACTION_STATUS_IDLE:
+                try:
+                    connection.rollback()
+                except psycopg2.Error:
+                    connection.close()
+        if connection.closed:
+            self.discard()
+            return
+        with self.condition:
+            self.idle.append(connection)
+            self.condition.notify()
+
+    def discard(self):
+        """Forget a connection which is closed or was never opened."""
+        with self.condition:
+            self.size -= 1
+            self.condition.notify()
+
+    def close(self):
+        """Close the idle connections of the pool."""
+        with self.condition:
+            idle, self.idle = self.idle, []
+            self.size -= len(idle)
+        for connection in idle:
+            connection.close()
+
+    def stats(self):
+        """Size, usage and wait counters of the pool."""
+        with self.condition:
+            return {
+                "max_size": self.max_size,
+                "size": self.size,
+                "idle": len(self.idle),
+                "in_use": self.size - len(self.idle),
+                "checkouts": self.checkouts,
+                "waits": self.waits,
+                "wait_time": round(self.wait_time, 6),
+                "timeouts": self.timeouts,
+            }
+
+
+def get_pool(alias, conn_params, options, check=None):
+    """
+    get_pool is a function to return the pool of the connections to the
+    database of conn_params, created on first use in each process, so
+    that forked workers never share the connections of their master.
+    """
+    key = (os.getpid(), alias, tuple(sorted(conn_params.items())))
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = ConnectionPool(check=check, **options)
+        return _pools[key]
+
+
+def get_pool_stats():
+    """Stats of the pools of the current process, by database alias."""
+    with _pools_lock:
+        pools = [
+            (alias, pool)
+            for (pid, alias, _), pool in _pools.items()
+            if pid == os.getpid()
+        ]
+    return {alias: pool.stats() for alias, pool in pools}
+
+
+def close_pools():
+    """Close the idle connections of every pool of the process."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close()
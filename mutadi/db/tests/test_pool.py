@@ -0,0 +1,138 @@
+"""Unit tests for database connections pool and backend"""
+import threading
+
+import psycopg2
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection, connections
+from mutadi.db.base import DatabaseWrapper
+from mutadi.db.pool import (
+    ConnectionPool,
+    PoolTimeout,
+    close_pools,
+    get_pool_stats,
+)
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def connect():
+    """Fixture for a function opening connections to the test database."""
+    params = connection.get_connection_params()
+    return lambda: psycopg2.connect(**params)
+
+
+@pytest.fixture
+def pooled_settings():
+    """Fixture for settings of a pooled connection, pools closed after."""
+    yield {
+        **connection.settings_dict,
+        "CONN_MAX_AGE": 0,
+        "OPTIONS": {"pool": {"max_size": 2, "timeout": 1}},
+    }
+    close_pools()
+
+
+class TestConnectionPool:
+    """Group multiple tests in connection pool."""
+
+    def test_connection_reused(self, connect):
+        """A released connection should be handed out again."""
+        pool = ConnectionPool(max_size=2)
+        first = pool.getconn(connect)
+        pool.putconn(first)
+        assert pool.getconn(connect) is first
+        stats = pool.stats()
+        assert stats["checkouts"] == 2
+        assert stats["size"] == stats["in_use"] == 1
+        pool.putconn(first)
+        pool.close()
+        assert first.closed
+
+    def test_timeout_when_full(self, connect):
+        """Waiting for a full pool should end with PoolTimeout."""
+        pool = ConnectionPool(max_size=1, timeout=0.05)
+        taken = pool.getconn(connect)
+        with pytest.raises(PoolTimeout):
+            pool.getconn(connect)
+        assert pool.stats()["timeouts"] == 1
+        taken.close()
+
+    def test_wait_for_release(self, connect):
+        """A thread should get the connection released by another."""
+        pool = ConnectionPool(max_size=1, timeout=5)
+        taken = pool.getconn(connect)
+        threading.Timer(0.05, pool.putconn, [taken]).start()
+        assert pool.getconn(connect) is taken
+        stats = pool.stats()
+        assert stats["waits"] == 1
+        assert stats["wait_time"] > 0
+        taken.close()
+
+    def test_transaction_rolled_back_on_release(self, connect):
+        """A connection should come back to the pool out of transaction."""
+        pool = ConnectionPool()
+        taken = pool.getconn(connect)
+        taken.cursor().execute("SELECT 1")
+        pool.putconn(taken)
+        status = taken.info.transaction_status
+        assert status == psycopg2.extensions.TRANSACTION_STATUS_IDLE
+        pool.close()
+
+    def test_closed_connection_discarded(self, connect):
+        """A closed connection should leave the pool."""
+        pool = ConnectionPool()
+        taken = pool.getconn(connect)
+        taken.close()
+        pool.putconn(taken)
+        assert pool.stats()["size"] == 0
+
+    def test_failed_check_replaces_connection(self, connect):
+        """An idle connection failing the check should be replaced."""
+        pool = ConnectionPool(check=lambda connection: False)
+        first = pool.getconn(connect)
+        pool.putconn(first)
+        second = pool.getconn(connect)
+        assert second is not first
+        assert first.closed
+        assert pool.stats()["size"] == 1
+        second.close()
+
+
+class TestDatabaseWrapper:
+    """Group multiple tests in mutadi.db backend."""
+
+    def test_health_check_reconnects(self):
+        """A connection dropped by the server should be replaced."""
+        wrapper = connections.create_connection("default")
+        wrapper.ensure_connection()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_terminate_backend(%s)",
+                [wrapper.connection.get_backend_pid()],
+            )
+        wrapper.close_if_unusable_or_obsolete()
+        with wrapper.cursor() as cursor:
+            cursor.execute("SELECT 1")
+            assert cursor.fetchone() == (1,)
+        wrapper.close()
+
+    def test_pooled_connections(self, pooled_settings):
+        """Closed connections should be given back to the pool."""
+        wrapper = DatabaseWrapper(pooled_settings, alias="pooled")
+        wrapper.ensure_connection()
+        pid = wrapper.connection.get_backend_pid()
+        wrapper.close()
+        assert get_pool_stats()["pooled"]["idle"] == 1
+        wrapper.ensure_connection()
+        assert wrapper.connection.get_backend_pid() == pid
+        assert get_pool_stats()["pooled"]["checkouts"] == 2
+        wrapper.close()
+
+    def test_pooled_connections_not_persistent(self, pooled_settings):
+        """A pool should not be combined with persistent connections."""
+        pooled_settings["CONN_MAX_AGE"] = 60
+        wrapper = DatabaseWrapper(pooled_settings, alias="pooled")
+        with pytest.raises(ImproperlyConfigured):
+            wrapper.ensure_connection()
@@ -0,0 +1,61 @@
+"""Request-scoped identity map shared by mutadi views"""
+from django.core.exceptions import ValidationError
+
+
+class IdentityMap:
+    """
+    Instances loaded during a request, by model and primary key, so that
+    the views and forms handling the same request share them instead of
+    loading them again.
+    """
+
+    def __init__(self):
+        self._instances = {}
+
+    def add(self, *instances):
+        """Remember the given instances, skipping the missing ones."""
+        for instance in instances:
+            if instance is not None:
+                key = (instance._meta.label, instance.pk)
+                self._instances[key] = instance
+
+    def get(self, queryset, pk):
+        """
+        Returns the instance of queryset (or model) with the given primary
+        key, loading it on first access only, or None when it does not
+        exist. A remembered instance is returned as is, whatever the
+        select_related of queryset. When queryset is filtered, a query
+        still checks that the instance passes the filters.
+        """
+        if isinstance(queryset, type):
+            queryset = queryset._default_manager.all()
+        model = queryset.model
+        try:
+            pk = model._meta.pk.to_python(pk)
+        except ValidationError:
+            return None
+        key = (model._meta.label, pk)
+        if not queryset.query.where:
+            if key not in self._instances:
+                self._instances[key] = queryset.filter(pk=pk).first()
+            return self._instances[key]
+        instance = self._instances.get(key)
+        if instance is not None:
+            return instance if queryset.filter(pk=pk).exists() else None
+        # a filtered out instance may still exist for other querysets
+        instance = queryset.filter(pk=pk).first()
+        if instance is not None:
+            self._instances[key] = instance
+        return instance
+
+
+def get_identity_map(request):
+    """
+    get_identity_map is a function to return the identity map of request,
+    created on first use with the authenticated user in it.
+    """
+    if not hasattr(request, "identity_map"):
+        request.identity_map = IdentityMap()
+        if request.user.is_authenticated:
+            request.identity_map.add(request.user)
+    return request.identity_map
@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+from django.db.models.signals import post_save
+
+
+class ImagesConfig(AppConfig):
+    name = "mutadi.images"
+
+    def ready(self):
+        from .renditions import IMAGE_FIELDS, generate_on_save
+
+        for label in IMAGE_FIELDS:
+            post_save.connect(generate_on_save, sender=label)
@@ -0,0 +1,24 @@
+"""Images generate_renditions command"""
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from mutadi.images.renditions import IMAGE_FIELDS, update_renditions
+
+
+class Command(BaseCommand):
+    """
+    Generate the missing renditions of the images uploaded before
+    the renditions existed, or whose file changed outside of save.
+    """
+
+    help = "Generate the responsive renditions of uploaded images."
+
+    def handle(self, *args, **options):
+        for label, (field_name, kinds) in IMAGE_FIELDS.items():
+            model = apps.get_model(label)
+            total = 0
+            for instance in model._default_manager.order_by("pk").iterator():
+                update_renditions(instance, field_name, kinds)
+                total += 1
+            self.stdout.write(
+                self.style.SUCCESS(f"{total} {label} image(s) checked.")
+            )
@@ -0,0 +1,39 @@
+"""Images process_images command"""
+import time
+
+from django.core.management.base import BaseCommand
+from mutadi.images.tasks import run_pending
+
+
+class Command(BaseCommand):
+    """
+    Image worker processing the queued uploads, for deployments running
+    without in-process workers. It must run on the host of the web
+    processes, as it only processes the uploads staged on its own host.
+    """
+
+    help = "Process the queued image uploads."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once the queue is empty.",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=2.0,
+            help="Seconds to wait when the queue is empty.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            handled = run_pending()
+            if handled:
+                self.stdout.write(
+                    self.style.SUCCESS(f"{handled} image(s) processed.")
+                )
+            if options["once"]:
+                break
+            time.sleep(options["sleep"])
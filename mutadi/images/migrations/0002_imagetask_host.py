@@ -0,0 +1,18 @@
+# Generated by Django 3.2.20 on 2026-10-18 13:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('images', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='imagetask',
+            name='host',
+            field=models.CharField(default='', max_length=255),
+        ),
+    ]
@@ -0,0 +1,26 @@
+"""Images views mixins"""
+from .tasks import enqueue_image
+
+
+class DeferredImageMixin:
+    """
+    ModelForm view mixin keeping the uploads of image_fields on local disk
+    and queuing their processing, so the request neither waits for the
+    resize nor for the transfer to the storage. The stored image, or a
+    placeholder for a new object, is served until the task is done.
+    """
+
+    image_fields = ()
+
+    def form_valid(self, form):
+        uploads = {}
+        for field_name in self.image_fields:
+            upload = form.cleaned_data.get(field_name)
+            if field_name in form.changed_data and upload:
+                uploads[field_name] = upload
+                current = getattr(form.initial.get(field_name), "name", "")
+                setattr(form.instance, field_name, current)
+        response = super().form_valid(form)
+        for field_name, upload in uploads.items():
+            enqueue_image(self.object, field_name, upload)
+        return response
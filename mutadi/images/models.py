@@ -0,0 +1,22 @@
+"""Images models configuration"""
+from django.db import models
+
+
+class ImageTask(models.Model):
+    """An uploaded image waiting to be processed and stored."""
+
+    model_label = models.CharField(max_length=100)
+    object_pk = models.PositiveIntegerField()
+    field_name = models.CharField(max_length=50)
+    # the uploads are staged on the local disk of this host
+    host = models.CharField(max_length=255, default="")
+    staged_name = models.CharField(max_length=255)
+    upload_name = models.CharField(max_length=255)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["pk"]
+
+    def __str__(self):
+        return f"{self.model_label}:{self.object_pk}.{self.field_name}"
@@ -0,0 +1,119 @@
+"""Responsive renditions of uploaded images"""
+import io
+import logging
+import posixpath
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+# kind: (width, height, crop) of the 1x rendition
+RENDITIONS = {
+    "card": (480, 320, False),
+    "sidebar": (80, 80, True),
+    "avatar": (64, 64, True),
+}
+DENSITIES = (1, 2)
+# model label: (image field, rendition kinds)
+IMAGE_FIELDS = {
+    "posts.Post": ("thumbnail", ("card", "sidebar")),
+    "members.Profile": ("profile_pic", ("avatar",)),
+}
+FORMATS = {
+    "webp": ("WEBP", {"quality": 80, "method": 4}),
+    "jpeg": ("JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+}
+
+
+def renditions_field_name(field_name):
+    """Name of the JSONField recording the renditions of field_name."""
+    return f"{field_name}_renditions"
+
+
+def resize(image, kind, density):
+    """
+    resize is a function to scale image down to the box of kind
+    at density, cropping it to fill the box for square renditions.
+    """
+    width, height, crop = RENDITIONS[kind]
+    size = (width * density, height * density)
+    if crop:
+        return ImageOps.fit(image, size, Image.LANCZOS)
+    image = image.copy()
+    image.thumbnail(size, Image.LANCZOS)
+    return image
+
+
+def generate_renditions(fieldfile, kinds):
+    """
+    generate_renditions is a function to write the WebP and JPEG
+    renditions of fieldfile next to it in its storage and return
+    their names: {"source": name, kind: {format: [1x, 2x]}}.
+    EXIF data is applied to the orientation, then dropped.
+    """
+    with fieldfile.open("rb"):
+        image = ImageOps.exif_transpose(Image.open(fieldfile))
+    image = image.convert("RGB")
+    root = posixpath.splitext(fieldfile.name)[0]
+    renditions = {"source": fieldfile.name}
+    for kind in kinds:
+        renditions[kind] = {extension: [] for extension in FORMATS}
+        for density in DENSITIES:
+            resized = resize(image, kind, density)
+            for extension, (image_format, options) in FORMATS.items():
+                buffer = io.BytesIO()
+                resized.save(buffer, image_format, **options)
+                name = fieldfile.storage.save(
+                    f"{root}_{kind}_{density}x.{extension}",
+                    ContentFile(buffer.getvalue()),
+                )
+                renditions[kind][extension].append(name)
+    return renditions
+
+
+def delete_renditions(storage, renditions):
+    """Remove the rendition files listed in renditions from storage."""
+    for kind, formats in renditions.items():
+        if kind == "source":
+            continue
+        for names in formats.values():
+            for name in names:
+                storage.delete(name)
+
+
+def update_renditions(instance, field_name, kinds):
+    """
+    update_renditions is a function to regenerate the renditions of
+    the image field_name of a saved instance when its file changed,
+    and record them on <field_name>_renditions with a queryset update.
+    The default image and unreadable files have no renditions,
+    templates then fall back to the original file.
+    """
+    fieldfile = getattr(instance, field_name)
+    attname = renditions_field_name(field_name)
+    current = getattr(instance, attname) or {}
+    name = fieldfile.name or ""
+    if name == instance._meta.get_field(field_name).default:
+        name = ""
+    if current.get("source", "") == name:
+        return
+    renditions = {"source": name}
+    if name:
+        try:
+            renditions = generate_renditions(fieldfile, kinds)
+        except OSError:
+            logger.warning("Cannot generate renditions of %s", name)
+    delete_renditions(fieldfile.storage, current)
+    setattr(instance, attname, renditions)
+    type(instance)._default_manager.filter(pk=instance.pk).update(
+        **{attname: renditions}
+    )
+
+
+def generate_on_save(sender, **kwargs):
+    """Update the renditions of the image field of a saved instance."""
+    if kwargs.get("raw"):
+        return
+    field_name, kinds = IMAGE_FIELDS[sender._meta.label]
+    update_renditions(kwargs["instance"], field_name, kinds)
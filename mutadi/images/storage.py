@@ -0,0 +1,89 @@
+"""Media storage memoizing the urls of its files"""
+import threading
+import time
+from collections import OrderedDict
+
+from storages.backends.s3boto3 import S3Boto3Storage
+from storages.utils import setting
+
+
+class URLCache:
+    """Thread-safe LRU cache of urls expiring after their own ttl."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Returns the url cached for key, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, key, url, ttl):
+        """Cache url for ttl seconds, evicting the least recently used."""
+        with self._lock:
+            self._entries[key] = (url, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """Hit and miss counters and current size of the cache."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+            }
+
+
+class CachedS3Storage(S3Boto3Storage):
+    """
+    S3 storage reusing the signed url of a file for half of its validity
+    instead of signing it again on every render of a listing. Urls of a
+    public custom domain (AWS_S3_CUSTOM_DOMAIN without querystring auth)
+    are never signed, so they bypass the cache.
+    """
+
+    def get_default_settings(self):
+        settings = super().get_default_settings()
+        settings["url_cache_size"] = setting("AWS_S3_URL_CACHE_SIZE", 1024)
+        return settings
+
+    def __init__(self, **settings):
+        super().__init__(**settings)
+        self.url_cache = URLCache(self.url_cache_size)
+
+    def url(self, name, parameters=None, expire=None, http_method=None):
+        if self.custom_domain and not self.querystring_auth:
+            return super().url(name, parameters, expire, http_method)
+        if expire is None:
+            expire = self.querystring_expire
+        key = (
+            name,
+            expire,
+            http_method,
+            tuple(sorted((parameters or {}).items())),
+        )
+        url = self.url_cache.get(key)
+        if url is None:
+            url = super().url(name, parameters, expire, http_method)
+            self.url_cache.set(key, url, expire / 2)
+        return url
@@ -0,0 +1,168 @@
+"""Background processing of uploaded images"""
+import io
+import logging
+import posixpath
+import socket
+from concurrent.futures import ThreadPoolExecutor
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.db import connections, transaction
+from django.db.models import F
+from PIL import Image, ImageOps
+
+from .models import ImageTask
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 3
+MAX_SIZE = (2048, 2048)
+
+_executor = None
+
+
+def get_staging_storage():
+    """Local storage keeping the uploads until they are processed."""
+    return FileSystemStorage(location=settings.IMAGE_STAGING_ROOT)
+
+
+def get_host():
+    """Name of the host whose staging directory this process reads."""
+    return socket.gethostname()
+
+
+def get_executor():
+    """Thread pool of the in-process image workers."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.IMAGE_TASK_THREADS,
+            thread_name_prefix="images",
+        )
+    return _executor
+
+
+def enqueue_image(instance, field_name, upload):
+    """
+    enqueue_image is a function to stage upload on local disk and queue
+    its processing into field_name of the saved instance. The in-process
+    workers pick it up once the current transaction is committed, and
+    only the workers of this host can, as the others cannot read it.
+    """
+    staged_name = get_staging_storage().save(
+        posixpath.basename(upload.name), upload
+    )
+    ImageTask.objects.create(
+        model_label=instance._meta.label,
+        object_pk=instance.pk,
+        field_name=field_name,
+        host=get_host(),
+        staged_name=staged_name,
+        upload_name=upload.name,
+    )
+    if settings.IMAGE_TASK_THREADS:
+        transaction.on_commit(lambda: get_executor().submit(drain))
+
+
+def prepare_image(file):
+    """
+    prepare_image is a function to scale the image of file down to
+    MAX_SIZE with its EXIF orientation applied and its metadata dropped.
+    Returns the encoded image and its file extension.
+    """
+    image = Image.open(file)
+    if image.format == "PNG":
+        image_format, extension, options = "PNG", ".png", {"optimize": True}
+    else:
+        image_format, extension = "JPEG", ".jpg"
+        options = {"quality": 85, "optimize": True, "progressive": True}
+    image = ImageOps.exif_transpose(image)
+    image.thumbnail(MAX_SIZE, Image.LANCZOS)
+    if image_format == "JPEG":
+        image = image.convert("RGB")
+    buffer = io.BytesIO()
+    image.save(buffer, image_format, **options)
+    return buffer.getvalue(), extension
+
+
+def process_task(task):
+    """
+    process_task is a function to store the staged image of task into its
+    field, which uploads it to the configured storage and triggers its
+    renditions, then to drop the task and its staged file.
+    """
+    staging_storage = get_staging_storage()
+    model = apps.get_model(task.model_label)
+    instance = model._default_manager.filter(pk=task.object_pk).first()
+    if instance is not None:
+        with staging_storage.open(task.staged_name) as staged:
+            content, extension = prepare_image(staged)
+        root = posixpath.splitext(posixpath.basename(task.upload_name))[0]
+        getattr(instance, task.field_name).save(
+            root + extension, ContentFile(content), save=False
+        )
+        # auto_now fields, e.g. updated_on, renew the caches keyed on them
+        touched = [
+            field.name
+            for field in model._meta.concrete_fields
+            if getattr(field, "auto_now", False)
+        ]
+        instance.save(update_fields=[task.field_name, *touched])
+    drop_task(task)
+
+
+def drop_task(task):
+    """Delete task, and its staged file once the deletion is committed."""
+    staging_storage = get_staging_storage()
+    task.delete()
+    transaction.on_commit(lambda: staging_storage.delete(task.staged_name))
+
+
+def run_pending(limit=None):
+    """
+    run_pending is a function to process the queued image tasks until
+    the queue is empty or limit tasks were handled, and return the number
+    of tasks handled. Only the tasks staged on this host are processed,
+    those locked by another worker are skipped and failing tasks are
+    retried up to MAX_ATTEMPTS times, then dropped with their file.
+    """
+    handled = 0
+    while limit is None or handled < limit:
+        with transaction.atomic():
+            task = (
+                ImageTask.objects.select_for_update(skip_locked=True)
+                .filter(host=get_host(), attempts__lt=MAX_ATTEMPTS)
+                .first()
+            )
+            if task is None:
+                break
+            try:
+                with transaction.atomic():
+                    process_task(task)
+            except Exception:
+                if task.attempts + 1 < MAX_ATTEMPTS:
+                    logger.warning(
+                        "Cannot process image task %s", task, exc_info=True
+                    )
+                    ImageTask.objects.filter(pk=task.pk).update(
+                        attempts=F("attempts") + 1
+                    )
+                else:
+                    logger.exception(
+                        "Giving up image task %s after %d attempts",
+                        task,
+                        MAX_ATTEMPTS,
+                    )
+                    drop_task(task)
+        handled += 1
+    return handled
+
+
+def drain():
+    """Run the pending tasks in a worker thread, then close its connections."""
+    try:
+        run_pending()
+    finally:
+        connections.close_all()
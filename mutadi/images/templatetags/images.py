@@ -0,0 +1,75 @@
+"""Template tags rendering responsive images"""
+from django import template
+from django.forms.utils import flatatt
+from django.templatetags.static import static
+from django.utils.html import format_html
+
+from ..renditions import renditions_field_name
+
+register = template.Library()
+
+PLACEHOLDER = "img/placeholder.jpg"
+
+
+def get_rendition_urls(instance, field_name, kind, extension):
+    """Urls of the kind renditions of an image field, by density."""
+    fieldfile = getattr(instance, field_name)
+    renditions = getattr(instance, renditions_field_name(field_name)) or {}
+    names = renditions.get(kind, {}).get(extension, [])
+    return [fieldfile.storage.url(name) for name in names]
+
+
+def get_srcset(urls):
+    """Density descriptors srcset of urls."""
+    return ", ".join(
+        f"{url} {density}x" for density, url in enumerate(urls, start=1)
+    )
+
+
+@register.simple_tag
+def srcset(instance, field_name, kind, extension="jpeg"):
+    """
+    Usage: <img srcset="{% srcset post "thumbnail" "card" %}" ...>
+    Empty when the image has no renditions.
+    """
+    return get_srcset(
+        get_rendition_urls(instance, field_name, kind, extension)
+    )
+
+
+@register.simple_tag
+def image_url(instance, field_name):
+    """
+    Usage: <img src="{% image_url post "thumbnail" %}" ...>
+    Url of the original image, or of the placeholder while the first
+    upload of the image is being processed.
+    """
+    fieldfile = getattr(instance, field_name)
+    return fieldfile.url if fieldfile else static(PLACEHOLDER)
+
+
+@register.simple_tag
+def picture(instance, field_name, kind, **attrs):
+    """
+    Usage: {% picture post "thumbnail" "card" alt="..." class="img-fluid" %}
+    Renders a <picture> offering the WebP renditions of the image with
+    a JPEG fallback, or a plain <img> of the original file, or of the
+    placeholder, when the renditions are missing.
+    """
+    jpeg = get_rendition_urls(instance, field_name, kind, "jpeg")
+    if not jpeg:
+        return format_html(
+            "<img src=\"{}\"{} />",
+            image_url(instance, field_name),
+            flatatt(attrs),
+        )
+    return format_html(
+        "<picture>"
+        "<source type=\"image/webp\" srcset=\"{}\" />"
+        "<img src=\"{}\" srcset=\"{}\"{} />"
+        "</picture>",
+        get_srcset(get_rendition_urls(instance, field_name, kind, "webp")),
+        jpeg[0],
+        get_srcset(jpeg),
+        flatatt(attrs),
+    )
@@ -0,0 +1,159 @@
+"""Unit tests for images app renditions"""
+from io import BytesIO, StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.template import Context, Template
+from model_bakery import baker
+from mutadi.images.renditions import DENSITIES, RENDITIONS
+from mutadi.posts.models import Post
+from PIL import Image
+
+pytestmark = pytest.mark.django_db
+
+User = get_user_model()
+
+
+def make_image(name="photo.jpg", size=(1200, 800)):
+    """Returns an uploaded JPEG file of the given size."""
+    buffer = BytesIO()
+    Image.new("RGB", size, "teal").save(buffer, "JPEG")
+    return SimpleUploadedFile(name, buffer.getvalue(), "image/jpeg")
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    """Store uploads of these tests in a temporary directory."""
+    settings.MEDIA_ROOT = str(tmp_path)
+
+
+class TestRenditions:
+    """Group multiple tests in image renditions."""
+
+    @pytest.fixture
+    def proto_post(self):
+        """Fixture for baked Post model with an uploaded thumbnail."""
+        return baker.make(
+            Post,
+            content="Velit anim consequat in.",
+            thumbnail=make_image(),
+        )
+
+    def test_renditions_generated_on_upload(self, proto_post):
+        """Card and sidebar renditions should be recorded on the post."""
+        proto_post.refresh_from_db()
+        renditions = proto_post.thumbnail_renditions
+        assert renditions["source"] == proto_post.thumbnail.name
+        for kind in ("card", "sidebar"):
+            assert set(renditions[kind]) == {"webp", "jpeg"}
+            for names in renditions[kind].values():
+                assert len(names) == len(DENSITIES)
+                assert all(
+                    proto_post.thumbnail.storage.exists(name)
+                    for name in names
+                )
+
+    def test_rendition_sizes(self, proto_post):
+        """Renditions should fit their box, square ones being cropped."""
+        storage = proto_post.thumbnail.storage
+        renditions = proto_post.thumbnail_renditions
+        with storage.open(renditions["card"]["jpeg"][0]) as card:
+            assert Image.open(card).size == (480, 320)
+        width, height, _ = RENDITIONS["sidebar"]
+        with storage.open(renditions["sidebar"]["webp"][1]) as sidebar:
+            image = Image.open(sidebar)
+            assert image.format == "WEBP"
+            assert image.size == (width * 2, height * 2)
+
+    def test_renditions_kept_when_image_unchanged(self, proto_post):
+        """Saving a post without a new upload should keep its renditions."""
+        renditions = proto_post.thumbnail_renditions
+        proto_post.title = "Nouveau titre"
+        proto_post.save()
+        proto_post.refresh_from_db()
+        assert proto_post.thumbnail_renditions == renditions
+
+    def test_renditions_replaced_with_image(self, proto_post):
+        """A new upload should replace the renditions of the old one."""
+        storage = proto_post.thumbnail.storage
+        old_names = proto_post.thumbnail_renditions["card"]["jpeg"]
+        proto_post.thumbnail = make_image("other.jpg")
+        proto_post.save()
+        proto_post.refresh_from_db()
+        assert "other" in proto_post.thumbnail_renditions["card"]["jpeg"][0]
+        assert not any(storage.exists(name) for name in old_names)
+
+    def test_default_profile_pic_has_no_renditions(self):
+        """The default profile picture should not be processed."""
+        user = baker.make(User)
+        assert user.profile.profile_pic_renditions == {}
+
+    def test_avatar_renditions_of_profile_pic(self):
+        """An uploaded profile picture should get avatar renditions."""
+        profile = baker.make(User).profile
+        profile.profile_pic = make_image("me.jpg")
+        profile.save()
+        profile.refresh_from_db()
+        assert set(profile.profile_pic_renditions) == {"source", "avatar"}
+
+    def test_unreadable_image_has_no_renditions(self):
+        """A file which is not an image should fall back to the original."""
+        post = baker.make(
+            Post,
+            content="Velit anim consequat in.",
+            thumbnail=SimpleUploadedFile("broken.jpg", b"not an image"),
+        )
+        assert post.thumbnail_renditions == {"source": post.thumbnail.name}
+
+    def test_generate_renditions_command(self, proto_post):
+        """Command should generate renditions missing from existing rows."""
+        Post.objects.update(thumbnail_renditions={})
+        out = StringIO()
+        call_command("generate_renditions", stdout=out)
+        assert "1 posts.Post image(s) checked." in out.getvalue()
+        proto_post.refresh_from_db()
+        assert "card" in proto_post.thumbnail_renditions
+
+
+class TestPictureTag:
+    """Group multiple tests in picture and srcset template tags."""
+
+    def render(self, source, **context):
+        return Template("{% load images %}" + source).render(
+            Context(context)
+        )
+
+    def test_picture_with_renditions(self):
+        """picture should offer WebP and JPEG srcset at 1x and 2x."""
+        post = baker.make(
+            Post, content="Velit anim consequat in.", thumbnail=make_image()
+        )
+        html = self.render(
+            '{% picture post "thumbnail" "card" alt="..." class="img-fluid" %}',
+            post=post,
+        )
+        assert html.startswith("<picture>")
+        assert 'type="image/webp"' in html
+        assert "card_1x.webp 1x" in html
+        assert "card_2x.jpeg 2x" in html
+        assert 'class="img-fluid"' in html
+
+    def test_picture_falls_back_to_original(self):
+        """picture should render the original image without renditions."""
+        post = baker.make(
+            Post, content="Velit anim consequat in.", _create_files=True
+        )
+        Post.objects.update(thumbnail_renditions={})
+        post.refresh_from_db()
+        html = self.render('{% picture post "thumbnail" "card" %}', post=post)
+        assert html == f'<img src="{post.thumbnail.url}" />'
+
+    def test_srcset(self):
+        """srcset should list the JPEG renditions by density."""
+        post = baker.make(
+            Post, content="Velit anim consequat in.", thumbnail=make_image()
+        )
+        html = self.render('{% srcset post "thumbnail" "sidebar" %}', post=post)
+        assert html.endswith("sidebar_2x.jpeg 2x")
@@ -0,0 +1,84 @@
+"""Unit tests for images app storage"""
+from unittest import mock
+
+import pytest
+from mutadi.images.storage import CachedS3Storage, URLCache
+
+
+@pytest.fixture
+def storage():
+    """Fixture for a storage signing urls with fake credentials."""
+    return CachedS3Storage(
+        access_key="AKIAEXAMPLE",
+        secret_key="secret",
+        bucket_name="mutadi",
+        region_name="eu-west-3",
+        signature_version="s3v4",
+        querystring_auth=True,
+        custom_domain=None,
+        url_cache_size=2,
+    )
+
+
+class TestCachedS3Storage:
+    """Group multiple tests in CachedS3Storage."""
+
+    def test_signed_url_memoized(self, storage):
+        """A url should be signed once then served from the cache."""
+        url = storage.url("images/photo.jpg")
+        assert "X-Amz-Signature" in url
+        assert storage.url("images/photo.jpg") == url
+        assert storage.url_cache.stats() == {
+            "hits": 1,
+            "misses": 1,
+            "size": 1,
+        }
+
+    def test_cache_keyed_on_expiry(self, storage):
+        """Urls of the same file with other expiries should differ."""
+        assert storage.url("images/photo.jpg", expire=60) != storage.url(
+            "images/photo.jpg", expire=120
+        )
+        assert storage.url_cache.stats()["misses"] == 2
+
+    def test_least_recently_used_evicted(self, storage):
+        """The cache should keep url_cache_size urls at most."""
+        for name in ("a.jpg", "b.jpg", "a.jpg", "c.jpg", "a.jpg", "b.jpg"):
+            storage.url(name)
+        assert storage.url_cache.stats() == {
+            "hits": 2,
+            "misses": 4,
+            "size": 2,
+        }
+
+    def test_url_signed_again_after_half_validity(self, storage):
+        """A cached url should be renewed after half of its validity."""
+        with mock.patch("mutadi.images.storage.time.monotonic") as monotonic:
+            monotonic.return_value = 1000
+            storage.url("images/photo.jpg", expire=600)
+            monotonic.return_value = 1299
+            storage.url("images/photo.jpg", expire=600)
+            monotonic.return_value = 1301
+            storage.url("images/photo.jpg", expire=600)
+        assert storage.url_cache.stats()["misses"] == 2
+
+    def test_public_domain_not_signed(self, storage):
+        """Urls of a public custom domain should bypass signing and cache."""
+        storage.custom_domain = "cdn.mutadi.fr"
+        storage.querystring_auth = False
+        url = storage.url("images/photo.jpg")
+        assert url == "https://cdn.mutadi.fr/images/photo.jpg"
+        assert storage.url_cache.stats()["misses"] == 0
+
+
+class TestURLCache:
+    """Group multiple tests in URLCache."""
+
+    def test_clear_resets_counters(self):
+        """clear should drop urls and counters."""
+        cache = URLCache(10)
+        cache.set("key", "url", 60)
+        assert cache.get("key") == "url"
+        cache.clear()
+        assert cache.get("key") is None
+        assert cache.stats() == {"hits": 0, "misses": 1, "size": 0}
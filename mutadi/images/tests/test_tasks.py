@@ -0,0 +1,195 @@
+"""Unit tests for images app background tasks"""
+import os
+from io import BytesIO, StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.urls import reverse
+from model_bakery import baker
+from mutadi.images.models import ImageTask
+from mutadi.images.tasks import MAX_ATTEMPTS, enqueue_image, run_pending
+from mutadi.posts.models import Category, Post
+from PIL import Image
+
+pytestmark = pytest.mark.django_db
+
+User = get_user_model()
+
+
+def make_image(name="photo.jpg", size=(3000, 1000), orientation=None):
+    """Returns an uploaded JPEG file, rotated by its EXIF orientation."""
+    buffer = BytesIO()
+    exif = Image.Exif()
+    if orientation:
+        exif[0x0112] = orientation
+    Image.new("RGB", size, "teal").save(buffer, "JPEG", exif=exif)
+    return SimpleUploadedFile(name, buffer.getvalue(), "image/jpeg")
+
+
+@pytest.fixture(autouse=True)
+def image_settings(settings, tmp_path):
+    """Stage and store uploads of these tests in a temporary directory."""
+    settings.MEDIA_ROOT = str(tmp_path / "media")
+    settings.IMAGE_STAGING_ROOT = str(tmp_path / "staging")
+    settings.IMAGE_TASK_THREADS = 0
+    return settings
+
+
+class TestDeferredUploads:
+    """Group multiple tests in deferred image uploads of views."""
+
+    @pytest.fixture
+    def proto_user(self, client):
+        """Fixture for a logged in baked User model."""
+        user = baker.make(User)
+        client.force_login(user)
+        return user
+
+    @pytest.fixture
+    def post_data(self):
+        """Fixture for the data of the post form."""
+        # explicit pk: posts form tests rely on the categories sequence
+        category = baker.make(Category, pk=1000)
+        return {
+            "title": "Titre",
+            "categories": [category.pk],
+            "overview": "Présentation",
+            "content": "Contenu",
+            "featured": False,
+            "status": 1,
+            "thumbnail": make_image(),
+        }
+
+    def test_add_post_queues_thumbnail(self, client, proto_user, post_data):
+        """Add post view should store the thumbnail in background."""
+        response = client.post(reverse("add_post"), post_data)
+        assert response.status_code == 302
+        post = Post.objects.get()
+        assert not post.thumbnail
+        task = ImageTask.objects.get()
+        assert (task.model_label, task.object_pk, task.field_name) == (
+            "posts.Post",
+            post.pk,
+            "thumbnail",
+        )
+        response = client.get(reverse("post_detail", args=[post.pk]))
+        assert b"/static/img/placeholder.jpg" in response.content
+
+    def test_update_post_keeps_thumbnail_until_processed(
+        self, client, proto_user, post_data
+    ):
+        """Update post view should serve the old thumbnail meanwhile."""
+        post = baker.make(
+            Post, author=proto_user, content="Contenu", thumbnail=make_image()
+        )
+        old_name = post.thumbnail.name
+        client.post(reverse("update_post", args=[post.pk]), post_data)
+        post.refresh_from_db()
+        assert post.thumbnail.name == old_name
+        assert post.title == "Titre"
+        assert run_pending() == 1
+        post.refresh_from_db()
+        assert post.thumbnail.name != old_name
+
+    def test_edit_profile_queues_profile_pic(self, client, proto_user):
+        """Profile edit view should store the picture in background."""
+        client.post(
+            reverse("edit_user_profile", args=[proto_user.profile.pk]),
+            {"bio": "Bio", "profile_pic": make_image("me.jpg")},
+        )
+        proto_user.profile.refresh_from_db()
+        assert proto_user.profile.profile_pic.name == (
+            "default_profile_picture.jpg"
+        )
+        assert ImageTask.objects.get().field_name == "profile_pic"
+
+
+class TestRunPending:
+    """Group multiple tests in image tasks processing."""
+
+    @pytest.fixture
+    def proto_post(self):
+        """Fixture for baked Post model waiting for its thumbnail."""
+        post = baker.make(Post, content="Contenu")
+        enqueue_image(post, "thumbnail", make_image(orientation=6))
+        return post
+
+    def test_task_stores_prepared_image(
+        self, django_capture_on_commit_callbacks, image_settings, proto_post
+    ):
+        """
+        Task should store the image resized, rotated and without EXIF,
+        generate its renditions, then drop the task and the staged file.
+        """
+        with django_capture_on_commit_callbacks(execute=True):
+            assert run_pending() == 1
+        proto_post.refresh_from_db()
+        assert proto_post.thumbnail.name.startswith("images/photo")
+        with proto_post.thumbnail.open() as stored:
+            image = Image.open(stored)
+            assert image.size == (683, 2048)
+            assert not image.getexif()
+        assert "card" in proto_post.thumbnail_renditions
+        assert not ImageTask.objects.exists()
+        assert not os.listdir(image_settings.IMAGE_STAGING_ROOT)
+
+    def test_task_moves_updated_on(self, proto_post):
+        """Storing the image should renew the cached cards of the post."""
+        updated_on = Post.objects.get(pk=proto_post.pk).updated_on
+        run_pending()
+        assert Post.objects.get(pk=proto_post.pk).updated_on > updated_on
+
+    def test_failing_task_retried_then_dropped(
+        self, caplog, django_capture_on_commit_callbacks, image_settings
+    ):
+        """
+        Failing task should be retried up to MAX_ATTEMPTS times, then
+        dropped with its staged file and reported as an error.
+        """
+        post = baker.make(Post, content="Contenu")
+        enqueue_image(
+            post,
+            "thumbnail",
+            SimpleUploadedFile("broken.jpg", b"not an image", "image/jpeg"),
+        )
+        with django_capture_on_commit_callbacks(execute=True):
+            assert run_pending(limit=MAX_ATTEMPTS - 1) == MAX_ATTEMPTS - 1
+            assert ImageTask.objects.get().attempts == MAX_ATTEMPTS - 1
+            assert run_pending() == 1
+        assert not ImageTask.objects.exists()
+        assert not os.listdir(image_settings.IMAGE_STAGING_ROOT)
+        errors = [
+            record for record in caplog.records if record.levelname == "ERROR"
+        ]
+        assert len(errors) == 1
+        assert "Giving up" in errors[0].getMessage()
+
+    def test_task_of_other_host_left(self, proto_post):
+        """Tasks staged on another host should be left to its workers."""
+        ImageTask.objects.update(host="other-host")
+        assert run_pending() == 0
+        assert ImageTask.objects.get().attempts == 0
+
+    def test_task_of_deleted_object_dropped(self, proto_post):
+        """Task should be dropped when its object no longer exists."""
+        proto_post.delete()
+        assert run_pending() == 1
+        assert not ImageTask.objects.exists()
+
+    def test_enqueue_schedules_workers_on_commit(
+        self, django_capture_on_commit_callbacks, image_settings
+    ):
+        """In-process workers should start once the upload is committed."""
+        image_settings.IMAGE_TASK_THREADS = 1
+        post = baker.make(Post, content="Contenu")
+        with django_capture_on_commit_callbacks() as callbacks:
+            enqueue_image(post, "thumbnail", make_image())
+        assert len(callbacks) == 1
+
+    def test_process_images_command(self, proto_post):
+        """Command should process the queue and exit with --once."""
+        out = StringIO()
+        call_command("process_images", once=True, stdout=out)
+        assert "1 image(s) processed." in out.getvalue()
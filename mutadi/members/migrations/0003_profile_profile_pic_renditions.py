@@ -0,0 +1,18 @@
+# Generated by Django 3.2.20 on 2026-10-18 12:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0002_auto_20201224_0029'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='profile_pic_renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
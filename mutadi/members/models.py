@@ -13,6 +13,9 @@ class Profile(models.Model):
     profile_pic = models.ImageField(
         default="default_profile_picture.jpg", upload_to="images/profile/"
     )
+    profile_pic_renditions = models.JSONField(
+        default=dict, blank=True, editable=False
+    )
 
     def __str__(self):
         return str(self.user)
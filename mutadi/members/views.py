@@ -4,6 +4,7 @@ from django.contrib.messages.views import SuccessMessageMixin
 from django.shortcuts import get_object_or_404, render
 from django.urls import reverse_lazy
 from django.views import generic
+from mutadi.images.mixins import DeferredImageMixin
 
 from .forms import (
     EditUserProfileForm,
@@ -75,7 +76,9 @@ class ShowProfilePageView(generic.DetailView):
 show_profile_page_view = ShowProfilePageView.as_view()
 
 
-class UserProfileEditView(SuccessMessageMixin, generic.UpdateView):
+class UserProfileEditView(
+    SuccessMessageMixin, DeferredImageMixin, generic.UpdateView
+):
     """User settings edit view"""
 
     model = Profile
@@ -83,6 +86,7 @@ class UserProfileEditView(SuccessMessageMixin, generic.UpdateView):
     form_class = EditUserProfileForm
     success_url = reverse_lazy("home")
     success_message = "Le profil utilisateur a été modifié avec succès !"
+    image_fields = ("profile_pic",)
 
 
 user_profile_edit_view = UserProfileEditView.as_view()
@@ -1,5 +1,23 @@
 from django.apps import AppConfig
+from django.db.models.signals import m2m_changed, post_delete, post_save
 
 
 class PagesConfig(AppConfig):
     name = "mutadi.pages"
+
+    def ready(self):
+        from mutadi.posts.models import Category, Comment, Post
+
+        from .cache import (
+            invalidate_category_pages,
+            invalidate_comment_pages,
+            invalidate_post_pages,
+        )
+
+        for signal in (post_save, post_delete):
+            signal.connect(invalidate_post_pages, sender=Post)
+            signal.connect(invalidate_category_pages, sender=Category)
+            signal.connect(invalidate_comment_pages, sender=Comment)
+        m2m_changed.connect(
+            invalidate_category_pages, sender=Post.categories.through
+        )
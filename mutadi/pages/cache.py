@@ -0,0 +1,146 @@
+"""Full page cache of the anonymous visitors"""
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import translation
+from mutadi.posts.models import Post
+
+PAGE_KEY_PREFIX = "pages:page"
+VERSION_KEY_PREFIX = "pages:version"
+
+
+def cache_anonymous_page(*groups):
+    """
+    cache_anonymous_page is a decorator to mark a view whose pages
+    PageCacheMiddleware caches for anonymous visitors until one of
+    groups is invalidated. Groups are formatted with the view kwargs,
+    e.g. "post-{pk}".
+    """
+
+    def decorator(view):
+        view.page_cache_groups = groups
+        return view
+
+    return decorator
+
+
+def invalidate_pages(*groups):
+    """
+    invalidate_pages is a function to drop the cached pages of groups
+    by giving them a new version. The versions change again once the
+    current transaction is committed, so that a page rendered meanwhile
+    from the old rows is not served.
+    """
+
+    def renew_versions():
+        cache.set_many(
+            {
+                f"{VERSION_KEY_PREFIX}:{group}": uuid.uuid4().hex
+                for group in groups
+            },
+            None,
+        )
+
+    renew_versions()
+    transaction.on_commit(renew_versions)
+
+
+def is_anonymous_visit(request):
+    """
+    Visitors without session cookie cannot be logged in, which spares
+    a session lookup. Pending messages must be shown to their visitor
+    only, so visits with a messages cookie are not cached either.
+    """
+    return (
+        settings.SESSION_COOKIE_NAME not in request.COOKIES
+        and CookieStorage.cookie_name not in request.COOKIES
+    )
+
+
+def get_page_key(request, groups):
+    """Cache key of the page of request in the current version of groups."""
+    version_keys = [f"{VERSION_KEY_PREFIX}:{group}" for group in groups]
+    versions = cache.get_many(version_keys)
+    page = ":".join(
+        [translation.get_language(), request.build_absolute_uri()]
+        + [versions.get(key, "") for key in version_keys]
+    )
+    return f"{PAGE_KEY_PREFIX}:{hashlib.md5(page.encode()).hexdigest()}"
+
+
+class PageCacheMiddleware:
+    """
+    Serves the pages of views marked by cache_anonymous_page from the
+    cache to anonymous visitors, and caches them on a miss, rendered from
+    the primary database, see ReplicaMiddleware. Responses of
+    those views tell in their X-Cache header whether they were a HIT, a
+    MISS or a BYPASS of the cache.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        status, key = getattr(request, "page_cache", (None, None))
+        if status is None:
+            return response
+        response["X-Cache"] = status
+        if (
+            status == "MISS"
+            and response.status_code == 200
+            and not response.streaming
+            and not response.cookies
+            and not request.META.get("CSRF_COOKIE_USED")
+        ):
+            cache.set(key, response, settings.PAGE_CACHE_TIMEOUT)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        groups = getattr(view_func, "page_cache_groups", None)
+        if groups is None:
+            return None
+        if request.method not in ("GET", "HEAD") or not is_anonymous_visit(
+            request
+        ):
+            request.page_cache = ("BYPASS", None)
+            return None
+        key = get_page_key(
+            request, [group.format(**view_kwargs) for group in groups]
+        )
+        response = cache.get(key)
+        if response is None:
+            request.page_cache = ("MISS", key)
+            request.fills_cache = True
+            return None
+        request.page_cache = ("HIT", key)
+        return response
+
+
+def invalidate_post_pages(sender, instance, **kwargs):
+    """Drop the pages showing a post which changed."""
+    invalidate_pages("listings", "sidebar", f"post-{instance.pk}")
+
+
+def invalidate_category_pages(sender, **kwargs):
+    """Drop the pages showing categories which changed."""
+    invalidate_pages("listings", "sidebar")
+
+
+def invalidate_comment_pages(sender, instance, **kwargs):
+    """
+    Drop the pages showing the comments total of the post of a comment:
+    its own page, the listings, and every page with the sidebar when
+    the post is one of the latest ones it shows.
+    """
+    groups = ["listings", f"post-{instance.post_id}"]
+    latest_posts = Post.objects.published().order_by("-created_on")
+    if instance.post_id in list(
+        latest_posts.values_list("pk", flat=True)[:3]
+    ):
+        groups.append("sidebar")
+    invalidate_pages(*groups)
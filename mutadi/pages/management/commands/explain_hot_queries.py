@@ -0,0 +1,172 @@
+"""Pages explain_hot_queries command"""
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+from mutadi.posts.models import PUBLISHED, Comment, Post
+from mutadi.private_messages.models import PrivateMessage, Thread
+
+User = get_user_model()
+
+
+def get_hot_queries(user, post, thread=None):
+    """
+    Returns the most frequent queries of the site, as run by the views,
+    with the name of the index each of them should use.
+    """
+    queries = [
+        (
+            "inbox",
+            PrivateMessage.objects.inbox(user)[:25],
+            "privatemessage_inbox_idx",
+        ),
+        (
+            "outbox",
+            PrivateMessage.objects.outbox(user)[:25],
+            "privatemessage_outbox_idx",
+        ),
+        (
+            "featured posts",
+            Post.objects.published()
+            .filter(featured=True)
+            .order_by("-created_on")[:3],
+            "post_featured_idx",
+        ),
+        (
+            "post list",
+            Post.objects.published().order_by("-created_on", "-pk")[:5],
+            "post_published_idx",
+        ),
+        (
+            "post comments",
+            post.get_comments,
+            "comment_post_timestamp_idx",
+        ),
+    ]
+    if thread is not None:
+        queries.append(
+            (
+                "conversation",
+                PrivateMessage.objects.in_thread(thread.pk, user),
+                "privatemessage_thread_idx",
+            )
+        )
+    return queries
+
+
+class Command(BaseCommand):
+    """
+    EXPLAIN the hot queries of the site and check each of them uses
+    its index. By default the check runs on a seeded dataset, inside a
+    transaction rolled back at the end.
+    """
+
+    help = "Check the hot queries of the site use their indexes."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--no-seed",
+            action="store_true",
+            help="Explain the queries on the existing data.",
+        )
+        parser.add_argument("--users", type=int, default=50)
+        parser.add_argument("--posts", type=int, default=2000)
+        parser.add_argument("--comments", type=int, default=20000)
+        parser.add_argument("--messages", type=int, default=20000)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            if options["no_seed"]:
+                user = User.objects.first()
+                post = Post.objects.first()
+                if user is None or post is None:
+                    raise CommandError("No user or post to explain.")
+                thread = Thread.objects.filter(
+                    messages__sender=user
+                ).first()
+            else:
+                user, post, thread = self.seed(options)
+            failures = self.check_plans(get_hot_queries(user, post, thread))
+            transaction.set_rollback(True)
+        if failures:
+            raise CommandError(
+                f"{failures} hot query(ies) do not use their index."
+            )
+
+    def seed(self, options):
+        """Bulk create the dataset and refresh the planner statistics."""
+        now = timezone.now()
+        User.objects.bulk_create(
+            User(username=f"explain-{index}")
+            for index in range(options["users"])
+        )
+        # Not every backend returns primary keys from bulk_create.
+        users = list(User.objects.filter(username__startswith="explain-"))
+        Post.objects.bulk_create(
+            Post(
+                title=f"Publication {index}",
+                author=users[index % len(users)],
+                overview="Présentation",
+                content="<p>Contenu</p>",
+                thumbnail="images/explain.jpg",
+                featured=index % 10 == 0,
+                status=PUBLISHED if index % 5 else 0,
+            )
+            for index in range(options["posts"])
+        )
+        posts = list(Post.objects.filter(thumbnail="images/explain.jpg"))
+        Comment.objects.bulk_create(
+            (
+                Comment(
+                    content="Commentaire",
+                    user=users[index % len(users)],
+                    post=posts[index % len(posts)],
+                )
+                for index in range(options["comments"])
+            ),
+            batch_size=1000,
+        )
+        Thread.objects.bulk_create(
+            (
+                Thread(subject="explain-thread")
+                for index in range(0, options["messages"], 5)
+            ),
+            batch_size=1000,
+        )
+        threads = list(Thread.objects.filter(subject="explain-thread"))
+        PrivateMessage.objects.bulk_create(
+            (
+                PrivateMessage(
+                    subject="Sujet",
+                    thread=threads[index // 5],
+                    sender=users[index % len(users)],
+                    recipient=users[(index + 1) % len(users)],
+                    sent_at=now - timedelta(minutes=index),
+                    content="<p>Message</p>",
+                    sender_deleted_at=now if index % 3 == 0 else None,
+                    recipient_deleted_at=now if index % 4 == 0 else None,
+                )
+                for index in range(options["messages"])
+            ),
+            batch_size=1000,
+        )
+        with connection.cursor() as cursor:
+            for model in (User, Post, Comment, Thread, PrivateMessage):
+                cursor.execute(f"ANALYZE {model._meta.db_table}")
+        return users[0], posts[0], threads[0]
+
+    def check_plans(self, queries):
+        """Print the verdict of every query and return the failures."""
+        failures = 0
+        for label, queryset, index in queries:
+            plan = queryset.explain()
+            if index in plan:
+                self.stdout.write(self.style.SUCCESS(f"{label}: {index}"))
+            else:
+                failures += 1
+                self.stdout.write(
+                    self.style.ERROR(f"{label}: {index} not used\n{plan}")
+                )
+        return failures
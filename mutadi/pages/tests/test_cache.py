@@ -0,0 +1,98 @@
+"""Unit tests for pages app full page cache"""
+import pytest
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.urls import reverse
+from model_bakery import baker
+from mutadi.posts.models import Category, Comment, Post
+
+pytestmark = pytest.mark.django_db
+
+
+class TestPageCache:
+    """Group multiple tests in the full page cache."""
+
+    @pytest.fixture
+    def proto_posts(self):
+        """Fixture for baked Post models."""
+        return baker.make(
+            Post,
+            title=baker.seq("Post-"),
+            content="Consequat aliqua non qui veniam sit voluptate.",
+            status=1,
+            _create_files=True,
+            _quantity=2,
+        )
+
+    def test_anonymous_page_cached(
+        self, client, django_assert_num_queries, proto_posts
+    ):
+        """Second anonymous visit should be served from the cache."""
+        url = reverse("post_list")
+        first = client.get(url)
+        assert first["X-Cache"] == "MISS"
+        with django_assert_num_queries(0):
+            second = client.get(url)
+        assert second["X-Cache"] == "HIT"
+        assert second.content == first.content
+
+    def test_logged_in_user_bypasses_cache(self, admin_client, proto_posts):
+        """Pages of logged in users should never be cached."""
+        url = reverse("post_list")
+        admin_client.get(url)
+        assert admin_client.get(url)["X-Cache"] == "BYPASS"
+
+    def test_messages_cookie_bypasses_cache(self, client, proto_posts):
+        """Pages with pending messages should never be cached."""
+        client.cookies[CookieStorage.cookie_name] = "pending"
+        assert client.get(reverse("home"))["X-Cache"] == "BYPASS"
+
+    def test_query_string_in_key(self, client, proto_posts):
+        """Pages of different query strings should be cached apart."""
+        url = reverse("post_list")
+        client.get(url)
+        assert client.get(f"{url}?after=1")["X-Cache"] == "MISS"
+
+    def test_view_not_marked_untouched(self, client):
+        """Pages of views not marked should not be cached."""
+        assert "X-Cache" not in client.get(reverse("search_results"))
+
+    def test_comment_invalidates_its_post_only(self, client, proto_posts):
+        """A comment out of the sidebar should drop its post page only."""
+        newer_posts = baker.make(
+            Post, content="Sit voluptate.", status=1, _quantity=3
+        )
+        urls = [
+            reverse("post_detail", args=[post.pk])
+            for post in (proto_posts[0], newer_posts[0])
+        ]
+        for url in urls:
+            client.get(url)
+        baker.make(Comment, post=proto_posts[0])
+        assert client.get(urls[0])["X-Cache"] == "MISS"
+        assert client.get(urls[1])["X-Cache"] == "HIT"
+
+    def test_latest_post_comment_invalidates_sidebar(
+        self, client, proto_posts
+    ):
+        """A comment on a post of the sidebar should drop every page."""
+        url = reverse("post_detail", args=[proto_posts[0].pk])
+        client.get(url)
+        baker.make(Comment, post=proto_posts[1])
+        assert client.get(url)["X-Cache"] == "MISS"
+
+    def test_post_change_invalidates_listings(self, client, proto_posts):
+        """Editing a post should drop the listings showing it."""
+        url = reverse("post_list")
+        client.get(url)
+        proto_posts[0].title = "Renamed"
+        proto_posts[0].save()
+        response = client.get(url)
+        assert response["X-Cache"] == "MISS"
+        assert b"Renamed" in response.content
+
+    def test_category_change_invalidates_listings(self, client, proto_posts):
+        """Adding a category to a post should drop the listings."""
+        url = reverse("home")
+        client.get(url)
+        proto_posts[0].categories.add(baker.make(Category, pk=1000))
+        assert client.get(url)["X-Cache"] == "MISS"
@@ -0,0 +1,33 @@
+"""Unit tests for pages app management commands"""
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from mutadi.posts.models import Post
+
+pytestmark = pytest.mark.django_db
+
+
+class TestExplainHotQueriesCommand:
+    """Group multiple tests in explain_hot_queries command."""
+
+    def test_hot_queries_use_their_index(self):
+        """Every hot query should use its index on a rolled back dataset."""
+        out = StringIO()
+        call_command(
+            "explain_hot_queries",
+            users=10,
+            posts=300,
+            comments=1000,
+            messages=1000,
+            stdout=out,
+        )
+        assert "not used" not in out.getvalue()
+        assert out.getvalue().count("_idx") == 6
+        assert Post.objects.count() == 0
+
+    def test_no_seed_without_data(self):
+        """Command should fail without data to explain."""
+        with pytest.raises(CommandError):
+            call_command("explain_hot_queries", no_seed=True)
@@ -20,6 +20,7 @@ class TestPagesViews:
             title=baker.seq("Post-"),
             content="Consequat aliqua non qui veniam sit voluptate.",
             featured=True,
+            status=1,
             _create_files=True,
             _quantity=6,
         )
@@ -48,6 +49,21 @@ class TestPagesViews:
         assert response.status_code == 200
         assertTemplateUsed(response, "pages/home.html")
 
+    def test_home_page_queries_do_not_depend_on_posts(
+        self, count_queries, proto_post
+    ):
+        """Home page should issue the same queries for 1 or 6 posts."""
+        six_posts = count_queries(reverse("home"))
+        Post.objects.exclude(pk=proto_post[0].pk).delete()
+        assert count_queries(reverse("home")) == six_posts
+
+    def test_homepage_hides_unpublished_posts(self, client, proto_post):
+        """Homepage should only display published posts."""
+        Post.objects.filter(pk=proto_post[-1].pk).update(status=0)
+        response = client.get(reverse("home"))
+        assert proto_post[-1] not in response.context_data["featured_posts"]
+        assert proto_post[-1] not in response.context_data["latest_posts"]
+
     def test_display_posts_on_homepage_is_three(self, client, proto_post):
         """Homepage shoud display only three featured_posts nor latest_posts"""
         response = client.get(reverse("home"))
@@ -93,3 +109,16 @@ class TestPagesViews:
         response = client.get(reverse("how"))
         assert response.status_code == 200
         assertTemplateUsed(response, "pages/how.html")
+
+    # Database status section
+    def test_database_status_for_staff(self, admin_client):
+        """Staff members should get the pools counters as JSON."""
+        response = admin_client.get(reverse("database_status"))
+        assert response.status_code == 200
+        assert "pools" in response.json()
+
+    def test_database_status_hidden_from_visitors(self, client):
+        """Visitors should be sent to the admin login page."""
+        response = client.get(reverse("database_status"))
+        assert response.status_code == 302
+        assert "/admin/login/" in response.url
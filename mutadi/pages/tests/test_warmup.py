@@ -0,0 +1,59 @@
+"""Unit tests for pages app warmup"""
+import copy
+
+from django.conf import settings
+from django.template import engines
+from django.test import override_settings
+from django.urls import reverse
+from mutadi.pages.warmup import (
+    get_project_templates,
+    warm_up,
+    warm_up_templates,
+    warm_up_urls,
+)
+
+
+def cached_templates_settings():
+    """TEMPLATES settings with the cached loader, as in production."""
+    templates = copy.deepcopy(settings.TEMPLATES)
+    templates[0]["OPTIONS"]["loaders"] = [
+        (
+            "django.template.loaders.cached.Loader",
+            [
+                "django.template.loaders.filesystem.Loader",
+                "django.template.loaders.app_directories.Loader",
+            ],
+        ),
+    ]
+    return templates
+
+
+class TestWarmup:
+    """Group multiple tests in process warmup."""
+
+    def test_project_templates_only(self):
+        """Templates of django.contrib apps should be left out."""
+        names = get_project_templates(engines["django"].engine)
+        assert "base.html" in names
+        assert "pages/home.html" in names
+        assert "admin/base.html" not in names
+
+    def test_templates_kept_by_cached_loader(self):
+        """Warmed up templates should be served by the cached loader."""
+        with override_settings(TEMPLATES=cached_templates_settings()):
+            engine = engines["django"].engine
+            assert warm_up_templates() == len(get_project_templates(engine))
+            cached = engine.template_loaders[0].get_template_cache
+            assert "post_card.html" in cached
+            assert "pages/home.html" in cached
+
+    def test_urls_reversed(self):
+        """Named urls, with arguments or not, should be reversed."""
+        assert warm_up_urls() >= 30
+        assert reverse("post_detail", args=[1])
+
+    def test_warm_up_logged(self, caplog):
+        """warm_up should log what it loaded."""
+        with caplog.at_level("INFO", logger="mutadi.pages.warmup"):
+            warm_up()
+        assert "Warmed up" in caplog.text
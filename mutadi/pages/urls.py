@@ -2,10 +2,11 @@
 """
 from django.urls import path
 
-from .views import home_view, how, tos
+from .views import database_status, home_view, how, tos
 
 urlpatterns = [
     path("", home_view, name="home"),
     path("tos/", tos, name="tos"),
     path("how/", how, name="how"),
+    path("status/database/", database_status, name="database_status"),
 ]
@@ -1,8 +1,15 @@
 """pages Views Configuration"""
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import JsonResponse
 from django.shortcuts import render
+from django.views.decorators.http import require_GET
 from django.views.generic import ListView
+from mutadi.db.pool import get_pool_stats
+from mutadi.db.replicas import read_from_replica
 from mutadi.posts.models import Post
 
+from .cache import cache_anonymous_page
+
 
 class HomeView(ListView):
     """Home page view"""
@@ -11,19 +18,29 @@ class HomeView(ListView):
     template_name = "pages/home.html"
 
     def get_context_data(self, **kwargs):
-        featured_posts = Post.objects.filter(featured=True).order_by(
-            "-created_on"
-        )[:3]
-        latest_posts = Post.objects.order_by("-created_on")[:3]
+        featured_posts = (
+            Post.objects.published()
+            .for_listing()
+            .filter(featured=True)
+            .order_by("-created_on")[:3]
+        )
+        latest_posts = (
+            Post.objects.published()
+            .for_listing()
+            .order_by("-created_on")[:3]
+        )
         context = super().get_context_data(**kwargs)
         context["featured_posts"] = featured_posts
         context["latest_posts"] = latest_posts
         return context
 
 
-home_view = HomeView.as_view()
+home_view = cache_anonymous_page("listings")(
+    read_from_replica(HomeView.as_view())
+)
 
 
+@cache_anonymous_page()
 def tos(request):
     """
     Here’s a view that returns the current terms of service,
@@ -33,6 +50,7 @@ def tos(request):
     return render(request, "pages/tos.html", context)
 
 
+@cache_anonymous_page()
 def how(request):
     """
     Here’s a view that returns the current how it works,
@@ -40,3 +58,13 @@ def how(request):
     """
     context = {}
     return render(request, "pages/how.html", context)
+
+
+@staff_member_required
+@require_GET
+def database_status(request):
+    """
+    Here’s a view that returns the counters of the database connection
+    pools of the process serving it, for monitoring, as a JSON document
+    """
+    return JsonResponse({"pools": get_pool_stats()})
@@ -0,0 +1,173 @@
+"""Keyset pagination shared by mutadi listings"""
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.http import Http404
+
+
+class InvalidCursor(Exception):
+    """The cursor token could not be decoded."""
+
+
+class CursorPage:
+    """A page of objects with the cursors of its neighbour pages."""
+
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.has_next_page = has_next
+        self.has_previous_page = has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.has_next_page
+
+    def has_previous(self):
+        return self.has_previous_page
+
+    def has_other_pages(self):
+        return self.has_next_page or self.has_previous_page
+
+    @property
+    def next_cursor(self):
+        """Token of the page after this one."""
+        if not self.has_next_page:
+            return None
+        return self.paginator.encode_cursor(self.object_list[-1])
+
+    @property
+    def previous_cursor(self):
+        """Token of the page before this one."""
+        if not self.has_previous_page:
+            return None
+        return self.paginator.encode_cursor(self.object_list[0])
+
+
+class CursorPaginator:
+    """
+    Keyset paginator: instead of an OFFSET and a COUNT(*), every page
+    filters on the ordering keys of the last row of the previous page,
+    so page N costs the same as page 1. keys must end with a unique
+    field, e.g. ("-created_on", "-pk").
+    """
+
+    def __init__(self, queryset, per_page, keys):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.keys = keys
+
+    def _fields(self):
+        opts = self.queryset.model._meta
+        for key in self.keys:
+            name = key.lstrip("-")
+            field = opts.pk if name == "pk" else opts.get_field(name)
+            yield name, field, key.startswith("-")
+
+    def encode_cursor(self, obj):
+        """Opaque token made of the ordering values of obj."""
+        values = [
+            field.value_to_string(obj) for _, field, _ in self._fields()
+        ]
+        return base64.urlsafe_b64encode(
+            json.dumps(values).encode()
+        ).decode()
+
+    def decode_cursor(self, token):
+        """Ordering values stored in token."""
+        try:
+            values = json.loads(base64.urlsafe_b64decode(token.encode()))
+            fields = list(self._fields())
+            if not isinstance(values, list) or len(values) != len(fields):
+                raise InvalidCursor(token)
+            return [
+                field.to_python(value)
+                for (_, field, _), value in zip(fields, values)
+            ]
+        except (
+            TypeError,
+            ValueError,
+            binascii.Error,
+            ValidationError,
+        ) as error:
+            raise InvalidCursor(token) from error
+
+    def _seek(self, values, backwards):
+        """Filter rows strictly after (or before) the given key values."""
+        condition = Q()
+        equal = Q()
+        for (name, _, descending), value in zip(self._fields(), values):
+            lookup = "lt" if descending != backwards else "gt"
+            condition |= equal & Q(**{f"{name}__{lookup}": value})
+            equal &= Q(**{name: value})
+        return condition
+
+    def get_page(self, after=None, before=None):
+        """
+        Returns the page following the after cursor, preceding the
+        before cursor, or the first page without cursor.
+        """
+        backwards = before is not None
+        cursor = before if backwards else after
+        ordering = self.keys
+        if backwards:
+            ordering = [
+                key[1:] if key.startswith("-") else f"-{key}"
+                for key in ordering
+            ]
+        queryset = self.queryset.order_by(*ordering)
+        if cursor is not None:
+            queryset = queryset.filter(
+                self._seek(self.decode_cursor(cursor), backwards)
+            )
+        object_list = list(queryset[: self.per_page + 1])
+        has_more = len(object_list) > self.per_page
+        object_list = object_list[: self.per_page]
+        # an empty page, e.g. past deleted rows, has no cursor to follow
+        if backwards:
+            object_list.reverse()
+            return CursorPage(object_list, self, bool(object_list), has_more)
+        return CursorPage(
+            object_list, self, has_more, cursor is not None and bool(object_list)
+        )
+
+
+class CursorPaginationMixin:
+    """
+    ListView mixin paginating with a CursorPaginator on cursor_keys,
+    reading the "after" and "before" cursors of the query string.
+    """
+
+    cursor_keys = ("-created_on", "-pk")
+
+    def paginate_queryset(self, queryset, page_size):
+        page = get_cursor_page(
+            self.request, queryset, page_size, self.cursor_keys
+        )
+        return (
+            page.paginator,
+            page,
+            page.object_list,
+            page.has_other_pages(),
+        )
+
+
+def get_cursor_page(request, queryset, per_page, keys):
+    """Returns the CursorPage requested by the query string of request."""
+    paginator = CursorPaginator(queryset, per_page, keys)
+    try:
+        return paginator.get_page(
+            after=request.GET.get("after"), before=request.GET.get("before")
+        )
+    except InvalidCursor:
+        raise Http404("Page invalide.")
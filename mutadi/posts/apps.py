@@ -1,5 +1,42 @@
 from django.apps import AppConfig
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+)
 
 
 class PostsConfig(AppConfig):
     name = "mutadi.posts"
+
+    def ready(self):
+        from .models import (
+            Category,
+            Comment,
+            Post,
+            recount_comments_total,
+            start_comments_delete,
+            touch_category_posts,
+            touch_recategorized_posts,
+            update_post_search_vector,
+        )
+        from .sidebar import invalidate_sidebar
+
+        pre_delete.connect(start_comments_delete, sender=Comment)
+        post_delete.connect(recount_comments_total, sender=Comment)
+        post_save.connect(touch_category_posts, sender=Category)
+        pre_delete.connect(touch_category_posts, sender=Category)
+        m2m_changed.connect(
+            update_post_search_vector, sender=Post.categories.through
+        )
+        m2m_changed.connect(
+            touch_recategorized_posts, sender=Post.categories.through
+        )
+
+        for model in (Post, Category, Comment):
+            post_save.connect(invalidate_sidebar, sender=model)
+            post_delete.connect(invalidate_sidebar, sender=model)
+        m2m_changed.connect(
+            invalidate_sidebar, sender=Post.categories.through
+        )
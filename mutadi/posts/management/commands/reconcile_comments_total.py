@@ -0,0 +1,42 @@
+"""Posts reconcile_comments_total command"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from mutadi.posts.models import Post
+
+
+class Command(BaseCommand):
+    """
+    Reset the comments counter of posts to their real number of comments,
+    walking the posts table by batches of primary keys.
+    """
+
+    help = "Reconcile Post.comments_total with the comments table."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of posts checked per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        last_pk = 0
+        fixed = 0
+        while True:
+            batch = list(
+                Post.objects.filter(pk__gt=last_pk)
+                .order_by("pk")
+                .values_list("pk", flat=True)[:batch_size]
+            )
+            if not batch:
+                break
+            with transaction.atomic():
+                fixed += Post.objects.filter(
+                    pk__in=batch
+                ).reconcile_comments_total()
+            last_pk = batch[-1]
+        self.stdout.write(
+            self.style.SUCCESS(f"{fixed} post(s) reconciled.")
+        )
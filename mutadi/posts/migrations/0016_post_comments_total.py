@@ -0,0 +1,33 @@
+# Generated by Django 3.2.20 on 2026-10-18 12:10
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_comments_total(apps, schema_editor):
+    Comment = apps.get_model('posts', 'Comment')
+    Post = apps.get_model('posts', 'Post')
+    comments = (
+        Comment.objects.filter(post=OuterRef('pk'))
+        .values('post')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    Post.objects.update(comments_total=Coalesce(Subquery(comments), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0015_auto_20210104_1354'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='comments_total',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_comments_total, migrations.RunPython.noop),
+    ]
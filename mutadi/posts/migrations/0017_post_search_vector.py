@@ -0,0 +1,56 @@
+# Generated by Django 3.2.20 on 2026-10-18 12:40
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import Value
+from django.utils.html import strip_tags
+
+
+class AddPostgresIndex(migrations.AddIndex):
+    """GIN indexes only exist on PostgreSQL, other backends skip them."""
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+def fill_search_vector(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    Post = apps.get_model('posts', 'Post')
+    posts = Post.objects.using(schema_editor.connection.alias)
+    for post in posts.prefetch_related('categories'):
+        categories = ' '.join(category.title for category in post.categories.all())
+        posts.filter(pk=post.pk).update(
+            search_vector=(
+                SearchVector(Value(post.title), weight='A', config='french')
+                + SearchVector(Value(post.overview), Value(categories), weight='B', config='french')
+                + SearchVector(Value(strip_tags(post.content)), weight='C', config='french')
+            )
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0016_post_comments_total'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        AddPostgresIndex(
+            model_name='post',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='post_search_vector_gin'),
+        ),
+        migrations.RunPython(fill_search_vector, migrations.RunPython.noop),
+    ]
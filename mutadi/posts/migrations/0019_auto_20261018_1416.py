@@ -0,0 +1,29 @@
+# Generated by Django 3.2.20 on 2026-10-18 12:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0018_auto_20261018_1413'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='post',
+            name='post_created_on_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='post',
+            name='post_featured_idx',
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('status', 1)), fields=['-created_on', '-id'], name='post_published_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('featured', True), ('status', 1)), fields=['-created_on'], name='post_featured_idx'),
+        ),
+    ]
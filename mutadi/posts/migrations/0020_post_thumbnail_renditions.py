@@ -0,0 +1,18 @@
+# Generated by Django 3.2.20 on 2026-10-18 12:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0019_auto_20261018_1416'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='thumbnail_renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
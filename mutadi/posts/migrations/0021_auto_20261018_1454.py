@@ -0,0 +1,21 @@
+# Generated by Django 3.2.20 on 2026-10-18 12:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0020_post_thumbnail_renditions'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='comment',
+            name='comment_post_timestamp_idx',
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['post', '-timestamp', '-id'], name='comment_post_timestamp_idx'),
+        ),
+    ]
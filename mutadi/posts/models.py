@@ -1,8 +1,22 @@
 """Posts models configuration"""
+import re
+from contextvars import ContextVar
+
 from ckeditor.fields import RichTextField
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    SearchVectorField,
+)
+from django.db import connections, models, transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
 from django.urls import reverse
+from django.utils import timezone
+from django.utils.html import strip_tags
 
 User = get_user_model()
 
@@ -26,14 +40,110 @@ class Comment(models.Model):
     timestamp = models.DateTimeField(auto_now_add=True)
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     post = models.ForeignKey(
-        "Post", related_name="comments", on_delete=models.CASCADE
+        "Post",
+        related_name="comments",
+        on_delete=models.CASCADE,
+        db_index=False,
     )
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["post", "-timestamp", "-id"],
+                name="comment_post_timestamp_idx",
+            ),
+        ]
+
     def __str__(self):
         return self.user.username
 
+    def save(self, *args, **kwargs):
+        """
+        save increments the comments counter of the post
+        in the same transaction as the comment creation.
+        """
+        created = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if created:
+                Post.objects.filter(pk=self.post_id).update(
+                    comments_total=F("comments_total") + 1
+                )
+
 
 STATUS = ((0, "Non publié"), (1, "Publié"))
+PUBLISHED = 1
+
+SEARCH_CONFIG = "french"
+
+
+class PostQuerySet(models.QuerySet):
+    """Custom queryset for posts."""
+
+    def published(self):
+        """published returns the posts visible on public listings."""
+        return self.filter(status=PUBLISHED)
+
+    def for_listing(self):
+        """
+        for_listing returns posts with everything a post card displays:
+        author and profile joined and categories prefetched.
+        """
+        return self.select_related("author__profile").prefetch_related(
+            "categories"
+        )
+
+    def reconcile_comments_total(self):
+        """
+        reconcile_comments_total resets comments_total to the real
+        number of comments for the posts of the queryset whose counter
+        drifted, and returns the number of posts fixed.
+        """
+        comments = (
+            Comment.objects.filter(post=OuterRef("pk"))
+            .values("post")
+            .annotate(total=Count("pk"))
+            .values("total")
+        )
+        drifted = self.annotate(actual=Count("comments")).exclude(
+            comments_total=F("actual")
+        )
+        return self.model.objects.filter(
+            pk__in=drifted.values("pk")
+        ).update(comments_total=Coalesce(Subquery(comments), 0))
+
+    def search(self, query):
+        """
+        search returns posts matching query, best ranked first.
+        PostgreSQL uses the indexed search_vector with french stemming,
+        matching either the parsed query or the prefix of every word,
+        other databases fall back on icontains filters.
+        """
+        if connections[self.db].vendor == "postgresql":
+            words = re.findall(r"\w+", query)
+            if not words:
+                return self.none()
+            search_query = SearchQuery(
+                query, config=SEARCH_CONFIG
+            ) | SearchQuery(
+                " & ".join(f"{word}:*" for word in words),
+                config=SEARCH_CONFIG,
+                search_type="raw",
+            )
+            return (
+                self.filter(search_vector=search_query)
+                .annotate(rank=SearchRank(F("search_vector"), search_query))
+                .order_by("-rank", "-created_on")
+            )
+        return (
+            self.filter(
+                Q(title__icontains=query)
+                | Q(overview__icontains=query)
+                | Q(categories__title__icontains=query)
+            )
+            .distinct()
+            .order_by("-created_on")
+        )
 
 
 class Post(models.Model):
@@ -47,8 +157,36 @@ class Post(models.Model):
     content = RichTextField()
     created_on = models.DateTimeField(auto_now_add=True)
     thumbnail = models.ImageField(upload_to="images/")
+    thumbnail_renditions = models.JSONField(
+        default=dict, blank=True, editable=False
+    )
     featured = models.BooleanField()
     status = models.IntegerField(choices=STATUS, default=0)
+    comments_total = models.PositiveIntegerField(default=0, editable=False)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = PostQuerySet.as_manager()
+
+    DERIVED_FIELDS = (
+        "comments_total",
+        "search_vector",
+        "thumbnail_renditions",
+    )
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=["search_vector"], name="post_search_vector_gin"),
+            models.Index(
+                fields=["-created_on", "-id"],
+                condition=models.Q(status=PUBLISHED),
+                name="post_published_idx",
+            ),
+            models.Index(
+                fields=["-created_on"],
+                condition=models.Q(featured=True, status=PUBLISHED),
+                name="post_featured_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.title + " | " + str(self.author)
@@ -57,18 +195,133 @@ class Post(models.Model):
         """get_absolute_url function allows to redirect to the home page."""
         return reverse("home")
 
+    def save(self, *args, **kwargs):
+        """
+        save never writes comments_total, search_vector and
+        thumbnail_renditions back on update, as comments maintain the first
+        with their own F() updates and the others are rebuilt
+        from the saved fields.
+        """
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.DERIVED_FIELDS
+            ]
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            self.update_search_vector()
+
+    def update_search_vector(self):
+        """
+        update_search_vector rebuilds the full-text search document:
+        title weighted A, overview and categories B,
+        content stripped of its CKEditor markup C.
+        """
+        if connections[self._state.db].vendor != "postgresql":
+            return
+        categories = " ".join(self.categories.values_list("title", flat=True))
+        Post.objects.filter(pk=self.pk).update(
+            search_vector=(
+                SearchVector(Value(self.title), weight="A", config=SEARCH_CONFIG)
+                + SearchVector(
+                    Value(self.overview),
+                    Value(categories),
+                    weight="B",
+                    config=SEARCH_CONFIG,
+                )
+                + SearchVector(
+                    Value(strip_tags(self.content)),
+                    weight="C",
+                    config=SEARCH_CONFIG,
+                )
+            )
+        )
+
     @property
     def get_comments(self):
         """
-        get_comments is a function to get comments
+        get_comments is a function to get comments with their author
         and return an object ordering by timestamp
         """
-        return self.comments.all().order_by("-timestamp")
+        return self.comments.select_related("user__profile").order_by(
+            "-timestamp", "-pk"
+        )
 
     @property
     def comment_count(self):
         """
         comment_count is a function to count comments
-        per post and return an object
+        per post and return the stored counter
         """
-        return Comment.objects.filter(post=self).count()
+        return self.comments_total
+
+
+# Posts whose counter the current delete of comments already recounted
+_recounted_posts = ContextVar("recounted_posts", default=None)
+
+
+def start_comments_delete(sender, **kwargs):
+    """
+    Forget the posts recounted by the previous delete, as a delete sends
+    all its pre_delete signals before its post_delete ones.
+    """
+    _recounted_posts.set(set())
+
+
+def recount_comments_total(sender, **kwargs):
+    """
+    Recount the comments counter of the post of a deleted comment.
+    Connected to post_delete, it also covers queryset deletes and
+    cascades from user deletion. A delete removes all its comments before
+    their post_delete signals, so each post is recounted once, with a
+    single query, however many of its comments are deleted.
+    """
+    post_id = kwargs["instance"].post_id
+    recounted = _recounted_posts.get()
+    if recounted is not None:
+        if post_id in recounted:
+            return
+        recounted.add(post_id)
+    Post.objects.filter(pk=post_id).reconcile_comments_total()
+
+
+def update_post_search_vector(sender, **kwargs):
+    """Rebuild the search document of posts when their categories change."""
+    if kwargs["action"] not in ("post_add", "post_remove", "post_clear"):
+        return
+    instance = kwargs["instance"]
+    if isinstance(instance, Post):
+        instance.update_search_vector()
+    elif kwargs["pk_set"]:
+        for post in Post.objects.filter(pk__in=kwargs["pk_set"]):
+            post.update_search_vector()
+
+
+def touch_category_posts(sender, **kwargs):
+    """
+    Move updated_on of the posts of a renamed or deleted category,
+    as it keys their cached cards.
+    """
+    if not kwargs.get("created"):
+        Post.objects.filter(categories=kwargs["instance"]).update(
+            updated_on=timezone.now()
+        )
+
+
+def touch_recategorized_posts(sender, **kwargs):
+    """Move updated_on of posts when their categories change."""
+    action = kwargs["action"]
+    instance = kwargs["instance"]
+    if isinstance(instance, Post):
+        if action not in ("post_add", "post_remove", "post_clear"):
+            return
+        posts = Post.objects.filter(pk=instance.pk)
+    elif action in ("post_add", "post_remove"):
+        posts = Post.objects.filter(pk__in=kwargs["pk_set"])
+    elif action == "pre_clear":
+        posts = Post.objects.filter(categories=instance)
+    else:
+        return
+    posts.update(updated_on=timezone.now())
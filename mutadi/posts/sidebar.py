@@ -0,0 +1,47 @@
+"""Posts sidebar data provider"""
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Count
+
+from .models import Post
+
+SIDEBAR_CACHE_KEY = "posts:sidebar"
+SIDEBAR_CACHE_TIMEOUT = 60 * 5
+
+
+def get_category_count():
+    """
+    Queryset to find post according titles of categories
+    and count of posts in a category.
+    """
+    queryset = (
+        Post.objects.published()
+        .values("categories__title")
+        .annotate(Count("categories__title"))
+    )
+    return queryset
+
+
+def get_sidebar_context():
+    """
+    Returns latest posts and category counts displayed by sidebar.html.
+    Results are evaluated once and kept in the cache until a post,
+    a category or a comment changes. They are read from the primary
+    database, as a lagging replica would cache rows already outdated.
+    """
+    context = cache.get(SIDEBAR_CACHE_KEY)
+    if context is None:
+        latest_posts = Post.objects.using(DEFAULT_DB_ALIAS).published()
+        context = {
+            "latest_posts": list(latest_posts.order_by("-created_on")[:3]),
+            "category_count": list(
+                get_category_count().using(DEFAULT_DB_ALIAS)
+            ),
+        }
+        cache.set(SIDEBAR_CACHE_KEY, context, SIDEBAR_CACHE_TIMEOUT)
+    return context
+
+
+def invalidate_sidebar(sender, **kwargs):
+    """Drop cached sidebar data when its source rows change."""
+    cache.delete(SIDEBAR_CACHE_KEY)
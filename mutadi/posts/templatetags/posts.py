@@ -0,0 +1,28 @@
+"""Template tags rendering posts"""
+from django import template
+
+register = template.Library()
+
+# Cards show the time since their post was created, which must not
+# stay cached for long even when the post does not change.
+POST_CARD_CACHE_TIMEOUT = 60 * 5
+
+
+@register.inclusion_tag("post_card.html", takes_context=True)
+def post_card(context, post, column="col-xl-6"):
+    """
+    Usage: {% post_card post "col-md-4" %}
+    Renders the card of a post in a listing column. The card is cached
+    as a fragment keyed on the post, its last update, its comments
+    counter and the name and picture of its author, so that every
+    listing reuses it until one of them changes. Posts should come from
+    Post.objects.for_listing(), which joins the author and profile.
+    The author of the post gets a card of their own with the edit links.
+    """
+    user = context.get("user")
+    return {
+        "post": post,
+        "column": column,
+        "is_author": getattr(user, "pk", None) == post.author_id,
+        "timeout": POST_CARD_CACHE_TIMEOUT,
+    }
@@ -0,0 +1,41 @@
+"""Unit tests for posts app management commands"""
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from model_bakery import baker
+from mutadi.posts.models import Comment, Post
+
+pytestmark = pytest.mark.django_db
+
+
+class TestReconcileCommentsTotalCommand:
+    """Group multiple tests in reconcile_comments_total command."""
+
+    @pytest.fixture
+    def proto_posts(self):
+        """Fixture for baked Post model with comments."""
+        posts = baker.make(
+            Post,
+            content="Laboris occaecat sint enim.",
+            _quantity=5,
+        )
+        for post in posts:
+            baker.make(Comment, post=post, _quantity=2)
+        return posts
+
+    def test_reconcile_drifted_posts_by_batches(self, proto_posts):
+        """Command should fix every drifted post across batches."""
+        Post.objects.update(comments_total=0)
+        out = StringIO()
+        call_command("reconcile_comments_total", batch_size=2, stdout=out)
+        assert "5 post(s) reconciled." in out.getvalue()
+        assert set(
+            Post.objects.values_list("comments_total", flat=True)
+        ) == {2}
+
+    def test_reconcile_without_drift(self, proto_posts):
+        """Command should not touch posts with a correct counter."""
+        out = StringIO()
+        call_command("reconcile_comments_total", stdout=out)
+        assert "0 post(s) reconciled." in out.getvalue()
@@ -1,6 +1,8 @@
 """Unit tests for posts app models"""
 import pytest
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from model_bakery import baker
 from mutadi.posts.models import Category, Comment, Post
 
@@ -131,6 +133,135 @@ class TestPostModel:
 
     def test_comment_count(self, proto_post, proto_comment):
         """comment_count method should all comments counted for a post."""
+        proto_post.refresh_from_db()
         assert proto_post.comment_count
         assert Post.objects.count() == 1
         assert Comment.objects.count() == 1
+
+    def test_comments_total_incremented_on_comment_creation(
+        self, proto_post
+    ):
+        """comments_total should count each created comment."""
+        baker.make(Comment, post=proto_post, _quantity=3)
+        proto_post.refresh_from_db()
+        assert proto_post.comments_total == 3
+
+    def test_comments_total_decremented_on_comment_deletion(
+        self, proto_post, proto_comment
+    ):
+        """comments_total should be decremented when a comment is deleted."""
+        proto_comment.delete()
+        proto_post.refresh_from_db()
+        assert proto_post.comments_total == 0
+
+    def test_comments_total_decremented_on_bulk_deletion(self, proto_post):
+        """comments_total should follow queryset deletes."""
+        baker.make(Comment, post=proto_post, _quantity=3)
+        Comment.objects.filter(post=proto_post).delete()
+        proto_post.refresh_from_db()
+        assert proto_post.comments_total == 0
+
+    def test_comments_total_recounted_once_per_post(self, proto_post):
+        """A bulk delete should recount each affected post once."""
+        other_post = baker.make(Post, content="Elit irure.")
+        baker.make(Comment, post=proto_post, _quantity=3)
+        baker.make(Comment, post=other_post, _quantity=2)
+        with CaptureQueriesContext(connection) as context:
+            Comment.objects.all().delete()
+        updates = [
+            query
+            for query in context.captured_queries
+            if query["sql"].startswith('UPDATE "posts_post"')
+        ]
+        assert len(updates) == 2
+        other_post.refresh_from_db()
+        assert other_post.comments_total == 0
+
+    def test_comments_total_decremented_on_user_deletion(
+        self, proto_post, proto_comment, proto_user
+    ):
+        """comments_total should follow comments cascaded by a user delete."""
+        baker.make(Comment, post=proto_post)
+        proto_user.delete()
+        proto_post.refresh_from_db()
+        assert proto_post.comments_total == 1
+
+    def test_post_save_keeps_comments_total(self, proto_post):
+        """Saving a stale post should not overwrite comments_total."""
+        stale_post = Post.objects.get(pk=proto_post.pk)
+        baker.make(Comment, post=proto_post, _quantity=2)
+        stale_post.title = "Updated title"
+        stale_post.save()
+        proto_post.refresh_from_db()
+        assert proto_post.title == "Updated title"
+        assert proto_post.comments_total == 2
+
+    def test_reconcile_comments_total(self, proto_post, proto_comment):
+        """reconcile_comments_total should fix drifted counters only."""
+        baker.make(Post, content="Elit irure.", _quantity=2)
+        Post.objects.filter(pk=proto_post.pk).update(comments_total=7)
+        assert Post.objects.reconcile_comments_total() == 1
+        proto_post.refresh_from_db()
+        assert proto_post.comments_total == 1
+
+    def test_for_listing_prefetches_relations(
+        self, django_assert_num_queries, proto_post
+    ):
+        """for_listing queryset should fetch post and categories only."""
+        with django_assert_num_queries(2):
+            post = Post.objects.for_listing().get(pk=proto_post.pk)
+            assert post.author.profile
+            assert list(post.categories.all())
+
+
+@pytest.mark.skipif(
+    connection.vendor != "postgresql",
+    reason="Full-text search needs PostgreSQL.",
+)
+class TestPostSearch:
+    """Group multiple tests in Post full-text search."""
+
+    @pytest.fixture
+    def proto_posts(self):
+        """Fixture for baked Post models with searchable text."""
+        in_content = baker.make(
+            Post,
+            title="Cours de cuisine",
+            overview="Partage de recettes",
+            content="<p>Je cherche des <strong>jardiniers</strong></p>",
+        )
+        in_title = baker.make(
+            Post,
+            title="Jardinage au potager",
+            overview="Besoin de bras",
+            content="<p>Tous les samedis</p>",
+        )
+        return in_content, in_title
+
+    def test_search_stems_words(self, proto_posts):
+        """search should find posts from a stemmed word of their content."""
+        assert list(Post.objects.search("jardinier")) == [proto_posts[0]]
+
+    def test_search_ignores_markup(self, proto_posts):
+        """search should not index CKEditor markup."""
+        assert not Post.objects.search("strong").exists()
+
+    def test_search_matches_word_prefixes(self, proto_posts):
+        """search should find posts from the beginning of a word."""
+        assert set(Post.objects.search("jardin")) == set(proto_posts)
+
+    def test_search_ranks_title_first(self, proto_posts):
+        """search should rank a title match above a content match."""
+        assert list(Post.objects.search("jardin")) == [
+            proto_posts[1],
+            proto_posts[0],
+        ]
+
+    def test_search_categories(self, proto_posts):
+        """search should find posts by the title of their categories."""
+        proto_posts[0].categories.add(baker.make(Category, title="Bricolage"))
+        assert list(Post.objects.search("bricolage")) == [proto_posts[0]]
+
+    def test_search_without_words(self, proto_posts):
+        """search should return nothing for a query without words."""
+        assert not Post.objects.search("& | !").exists()
@@ -0,0 +1,97 @@
+"""Unit tests for keyset pagination on posts"""
+import pytest
+from django.db import connection
+from django.http import Http404
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from model_bakery import baker
+from mutadi.pagination import CursorPaginator, InvalidCursor, get_cursor_page
+from mutadi.posts.models import Post
+
+pytestmark = pytest.mark.django_db
+
+factory = RequestFactory()
+
+
+class TestCursorPaginator:
+    """Group multiple tests in CursorPaginator."""
+
+    @pytest.fixture
+    def proto_posts(self):
+        """Fixture for baked Post models, newest first."""
+        posts = baker.make(
+            Post,
+            content="Officia magna sunt velit.",
+            _quantity=7,
+        )
+        return sorted(posts, key=lambda post: post.pk, reverse=True)
+
+    @pytest.fixture
+    def paginator(self):
+        """Fixture for a paginator of posts by three."""
+        return CursorPaginator(Post.objects.all(), 3, ("-created_on", "-pk"))
+
+    def test_first_page(self, paginator, proto_posts):
+        """First page should hold the newest posts."""
+        page = paginator.get_page()
+        assert list(page) == proto_posts[:3]
+        assert page.has_next()
+        assert not page.has_previous()
+        assert page.previous_cursor is None
+
+    def test_walk_forward_and_backward(self, paginator, proto_posts):
+        """Cursors should lead to the following and preceding pages."""
+        second = paginator.get_page(after=paginator.get_page().next_cursor)
+        assert list(second) == proto_posts[3:6]
+        last = paginator.get_page(after=second.next_cursor)
+        assert list(last) == proto_posts[6:]
+        assert not last.has_next()
+        back = paginator.get_page(before=last.previous_cursor)
+        assert list(back) == proto_posts[3:6]
+        first = paginator.get_page(before=back.previous_cursor)
+        assert list(first) == proto_posts[:3]
+        assert not first.has_previous()
+
+    def test_empty_pages(self, paginator, proto_posts):
+        """Pages past the ends should offer no cursor to follow."""
+        oldest = paginator.encode_cursor(proto_posts[-1])
+        newest = paginator.encode_cursor(proto_posts[0])
+        before = paginator.get_page(before=newest)
+        assert list(before) == []
+        assert not before.has_other_pages()
+        assert before.next_cursor is None
+        after = paginator.get_page(after=oldest)
+        assert list(after) == []
+        assert not after.has_other_pages()
+        assert after.previous_cursor is None
+
+    def test_ties_on_created_on(self, paginator, proto_posts):
+        """Posts sharing created_on should be split by their pk."""
+        Post.objects.update(created_on=proto_posts[0].created_on)
+        second = paginator.get_page(after=paginator.get_page().next_cursor)
+        assert list(second) == proto_posts[3:6]
+
+    def test_deep_page_uses_no_offset_nor_count(
+        self, paginator, proto_posts
+    ):
+        """A page should cost a single query without OFFSET nor COUNT."""
+        cursor = paginator.get_page().next_cursor
+        with CaptureQueriesContext(connection) as context:
+            paginator.get_page(after=cursor)
+        assert len(context) == 1
+        sql = context[0]["sql"].upper()
+        assert "OFFSET" not in sql
+        assert "COUNT(" not in sql
+
+    def test_invalid_cursor(self, paginator, proto_posts):
+        """A malformed cursor should be refused."""
+        with pytest.raises(InvalidCursor):
+            paginator.get_page(after="not-a-cursor")
+
+    def test_invalid_cursor_is_not_found(self, proto_posts):
+        """get_cursor_page should raise a 404 for a malformed cursor."""
+        request = factory.get("/", {"after": "bm90IGpzb24="})
+        with pytest.raises(Http404):
+            get_cursor_page(
+                request, Post.objects.all(), 3, ("-created_on", "-pk")
+            )
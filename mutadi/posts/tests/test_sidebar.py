@@ -0,0 +1,69 @@
+"""Unit tests for posts app sidebar"""
+import pytest
+from django.urls import reverse
+from model_bakery import baker
+from mutadi.posts.models import Category, Comment, Post
+from mutadi.posts.sidebar import get_sidebar_context
+
+pytestmark = pytest.mark.django_db
+
+
+class TestSidebarContext:
+    """Group multiple tests in sidebar context."""
+
+    @pytest.fixture
+    def proto_post(self):
+        """Fixture for baked Post model."""
+        return baker.make(
+            Post,
+            content="Nisi esse duis proident minim.",
+            status=1,
+            make_m2m=True,
+            _create_files=True,
+        )
+
+    def test_sidebar_context_content(self, proto_post):
+        """Sidebar context should have latest posts and category counts."""
+        context = get_sidebar_context()
+        assert context["latest_posts"] == [proto_post]
+        assert len(context["category_count"]) == 5
+
+    def test_sidebar_costs_no_query_on_cache_hit(
+        self, django_assert_num_queries, proto_post
+    ):
+        """Sidebar context should be served from cache once computed."""
+        get_sidebar_context()
+        with django_assert_num_queries(0):
+            context = get_sidebar_context()
+            assert context["latest_posts"][0].comments_total == 0
+
+    def test_sidebar_invalidated_on_post_save(self, proto_post):
+        """Sidebar context should be refreshed when a post is created."""
+        get_sidebar_context()
+        new_post = baker.make(Post, content="Nisi esse duis.", status=1)
+        assert get_sidebar_context()["latest_posts"][0] == new_post
+
+    def test_sidebar_invalidated_on_post_delete(self, proto_post):
+        """Sidebar context should be refreshed when a post is deleted."""
+        get_sidebar_context()
+        proto_post.delete()
+        assert get_sidebar_context()["latest_posts"] == []
+
+    def test_sidebar_invalidated_on_categories_change(self, proto_post):
+        """Sidebar context should be refreshed when categories change."""
+        get_sidebar_context()
+        proto_post.categories.add(baker.make(Category))
+        assert len(get_sidebar_context()["category_count"]) == 6
+
+    def test_sidebar_invalidated_on_comment_save(self, proto_post):
+        """Sidebar context should be refreshed when a comment is added."""
+        get_sidebar_context()
+        baker.make(Comment, post=proto_post)
+        latest_post = get_sidebar_context()["latest_posts"][0]
+        assert latest_post.comments_total == 1
+
+    def test_post_list_uses_cached_sidebar(self, admin_client, proto_post):
+        """post_list page should display cached sidebar data."""
+        admin_client.get(reverse("post_list"))
+        response = admin_client.get(reverse("post_list"))
+        assert response.context["latest_posts"] == [proto_post]
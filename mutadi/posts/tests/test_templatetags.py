@@ -0,0 +1,85 @@
+"""Unit tests for posts app template tags"""
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.template import Context, Template
+from model_bakery import baker
+from mutadi.posts.models import Category, Comment, Post
+
+pytestmark = pytest.mark.django_db
+
+User = get_user_model()
+
+
+class TestPostCardTag:
+    """Group multiple tests in post_card template tag."""
+
+    @pytest.fixture
+    def proto_post(self):
+        """Fixture for baked Post model with a category."""
+        post = baker.make(
+            Post,
+            title="Magna minim",
+            content="Nisi esse duis proident minim.",
+            status=1,
+            _create_files=True,
+        )
+        post.categories.add(baker.make(Category, pk=1000, title="Aide"))
+        return post
+
+    def render(self, post, user=None):
+        return Template("{% load posts %}{% post_card post %}").render(
+            Context({"post": post, "user": user or AnonymousUser()})
+        )
+
+    def test_post_card_content(self, proto_post):
+        """post_card should render the title, categories and counter."""
+        html = self.render(proto_post)
+        assert 'class="post col-xl-6"' in html
+        assert "Magna minim" in html
+        assert "Aide" in html
+        assert "fa-edit" not in html
+
+    def test_post_card_served_from_cache(
+        self, django_assert_num_queries, proto_post
+    ):
+        """A rendered card should be reused without any query."""
+        html = self.render(Post.objects.for_listing().get(pk=proto_post.pk))
+        post = Post.objects.for_listing().get(pk=proto_post.pk)
+        with django_assert_num_queries(0):
+            assert self.render(post) == html
+
+    def test_post_card_of_author(self, proto_post):
+        """Only the author should get the edit links of the post."""
+        self.render(proto_post)
+        assert "fa-edit" in self.render(proto_post, proto_post.author)
+        assert "fa-edit" not in self.render(proto_post, baker.make(User))
+
+    def test_post_card_renewed_on_comment(self, proto_post):
+        """A new comment should renew the card counter."""
+        self.render(proto_post)
+        baker.make(Comment, post=proto_post)
+        proto_post.refresh_from_db()
+        assert '<i class="icon-comment"></i>1' in self.render(proto_post)
+
+    def test_post_card_renewed_on_category_change(self, proto_post):
+        """Renaming a category should renew the cards of its posts."""
+        self.render(proto_post)
+        category = proto_post.categories.get()
+        category.title = "Entraide"
+        category.save()
+        proto_post.refresh_from_db()
+        assert "Entraide" in self.render(proto_post)
+
+    def test_post_card_renewed_on_author_change(self, proto_post):
+        """A new name or picture of the author should renew the card."""
+        self.render(proto_post)
+        author = proto_post.author
+        author.username = "nouveau_nom"
+        author.save()
+        author.profile.profile_pic.name = "images/profile/nouvelle.jpg"
+        author.profile.save()
+        post = Post.objects.for_listing().get(pk=proto_post.pk)
+        html = self.render(post)
+        assert "nouveau_nom" in html
+        assert "nouvelle" in html
@@ -5,7 +5,7 @@ from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import RequestFactory
 from django.urls import reverse
 from model_bakery import baker
-from mutadi.posts.models import Category, Post
+from mutadi.posts.models import Category, Comment, Post
 from mutadi.posts.views import add_post_view
 from pytest_django.asserts import assertRedirects, assertTemplateUsed
 
@@ -34,6 +34,7 @@ class TestPostlistViews:
                 "Ipsum nulla aute irure sint consequat "
                 "consequat proident irure voluptate."
             ),
+            status=1,
             make_m2m=True,
             _create_files=True,
             _quantity=6,
@@ -442,6 +443,7 @@ class TestCategoryViews:
             Post,
             categories__title=proto_category.title,
             content="Consequat aliqua non qui veniam sit voluptate.",
+            status=1,
             _create_files=True,
         )
 
@@ -516,6 +518,7 @@ class TestSearchResultsViews:
             Post,
             title=baker.seq("Post-"),
             content="Consequat aliqua non qui veniam sit voluptate.",
+            status=1,
             _create_files=True,
             _quantity=6,
         )
@@ -557,9 +560,148 @@ class TestSearchResultsViews:
         response = client.get(reverse("search_results"), {"q": "Moutarde"})
         assert response.context_data["post_searches"].count() == 0
 
+    def test_search_results_without_query(self, client, proto_post):
+        """search_results page should be empty without a query."""
+        response = client.get(reverse("search_results"))
+        assert response.status_code == 200
+        assert response.context_data["post_searches"].count() == 0
+
     def test_valid_search_pagination_is_four(self, client, proto_post):
         """Valid if search results pagination have six products on page."""
         response = client.get(reverse("search_results"), {"q": "Post"})
         assert response.status_code == 200
         assert "is_paginated" in response.context
         assert (len(response.context_data["post_searches"])) == 4
+
+
+class TestListingQueryCount:
+    """Group multiple tests on the number of queries of listing views."""
+
+    @pytest.fixture
+    def proto_category(self):
+        """Fixture for baked Category model."""
+        return baker.make(Category, title="Test")
+
+    @pytest.fixture
+    def make_posts(self, proto_category):
+        """Fixture baking posts with categories and comments."""
+
+        def _make_posts(quantity):
+            posts = baker.make(
+                Post,
+                title=baker.seq("Post-"),
+                content="Consequat aliqua non qui veniam sit voluptate.",
+                status=1,
+                make_m2m=True,
+                _create_files=True,
+                _quantity=quantity,
+            )
+            for post in posts:
+                post.categories.add(proto_category)
+                baker.make(Comment, post=post, _quantity=2)
+            return posts
+
+        return _make_posts
+
+    def test_post_list_queries_do_not_depend_on_page_size(
+        self, count_queries, make_posts
+    ):
+        """post_list page should issue the same queries for 1 or 4 posts."""
+        make_posts(1)
+        one_post = count_queries(reverse("post_list"))
+        make_posts(3)
+        assert count_queries(reverse("post_list")) == one_post
+
+    def test_category_queries_do_not_depend_on_page_size(
+        self, count_queries, make_posts
+    ):
+        """category page should issue the same queries for 1 or 4 posts."""
+        url = reverse("category", args=["Test"])
+        make_posts(1)
+        one_post = count_queries(url)
+        make_posts(3)
+        assert count_queries(url) == one_post
+
+    def test_search_results_queries_do_not_depend_on_page_size(
+        self, count_queries, make_posts
+    ):
+        """search_results page should issue the same queries for 1 or 4 posts."""
+        url = reverse("search_results")
+        make_posts(1)
+        one_post = count_queries(url, {"q": "Post"})
+        make_posts(3)
+        assert count_queries(url, {"q": "Post"}) == one_post
+
+    def test_listing_displays_comment_count(
+        self, client, make_posts
+    ):
+        """post_list page should display the number of comments per post."""
+        make_posts(1)
+        response = client.get(reverse("post_list"))
+        assert response.context_data["object_list"][0].comment_count == 2
+
+    def test_listings_hide_unpublished_posts(self, client, make_posts):
+        """Listing pages should not display unpublished posts."""
+        draft = make_posts(1)[0]
+        draft.status = 0
+        draft.save()
+        for url, data in (
+            (reverse("post_list"), None),
+            (reverse("category", args=["Test"]), None),
+            (reverse("search_results"), {"q": "Post"}),
+        ):
+            response = client.get(url, data)
+            assert draft.title not in response.content.decode()
+
+
+class TestPostCommentsViews:
+    """Group multiple tests in the paginated comments of a post."""
+
+    @pytest.fixture
+    def proto_post(self):
+        """Fixture for baked Post model."""
+        return baker.make(Post, content="Contenu", _create_files=True)
+
+    def make_comments(self, post, quantity):
+        """Bake quantity comments on post, the last one being the newest."""
+        return [
+            baker.make(Comment, post=post, content=f"Commentaire {index}")
+            for index in range(quantity)
+        ]
+
+    def test_detail_queries_do_not_depend_on_comments(
+        self, count_queries, proto_post
+    ):
+        """post_detail page should issue the same queries for 2 or 25."""
+        url = reverse("post_detail", args=[proto_post.pk])
+        self.make_comments(proto_post, 2)
+        two_comments = count_queries(url)
+        self.make_comments(proto_post, 23)
+        assert count_queries(url) == two_comments
+
+    def test_detail_shows_first_comments(self, client, proto_post):
+        """post_detail page should list the newest comments only."""
+        comments = self.make_comments(proto_post, 12)
+        response = client.get(reverse("post_detail", args=[proto_post.pk]))
+        assert list(response.context["comment_page"]) == comments[:1:-1]
+        assert b"Voir plus de commentaires" in response.content
+
+    def test_comments_fragment_continues_listing(self, client, proto_post):
+        """Comments fragment should list the comments after the cursor."""
+        comments = self.make_comments(proto_post, 12)
+        response = client.get(reverse("post_detail", args=[proto_post.pk]))
+        cursor = response.context["comment_page"].next_cursor
+        response = client.get(
+            reverse("post_comments", args=[proto_post.pk]), {"after": cursor}
+        )
+        assertTemplateUsed(response, "comment_list.html")
+        assert list(response.context["comment_page"]) == comments[1::-1]
+        assert b"<html" not in response.content
+        assert b"Voir plus de commentaires" not in response.content
+
+    def test_comments_fragment_invalid_cursor(self, client, proto_post):
+        """Comments fragment should answer 404 to an invalid cursor."""
+        response = client.get(
+            reverse("post_comments", args=[proto_post.pk]), {"after": "x"}
+        )
+        assert response.status_code == 404
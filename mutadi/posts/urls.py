@@ -5,6 +5,7 @@ from .views import (
     add_post_view,
     category_view,
     delete_post_view,
+    post_comments_view,
     post_detail_view,
     post_list_view,
     search_results_view,
@@ -14,6 +15,11 @@ from .views import (
 urlpatterns = [
     path("post_list/", post_list_view, name="post_list"),
     path("post_detail/<int:pk>", post_detail_view, name="post_detail"),
+    path(
+        "post_detail/<int:pk>/comments",
+        post_comments_view,
+        name="post_comments",
+    ),
     path("add_post/", add_post_view, name="add_post"),
     path("post_detail/edit/<int:pk>", update_post_view, name="update_post"),
     path("post_detail/<int:pk>/remove", delete_post_view, name="delete_post"),
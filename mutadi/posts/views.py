@@ -2,8 +2,6 @@
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.messages.views import SuccessMessageMixin
-from django.core.paginator import Paginator
-from django.db.models import Count, Q
 from django.shortcuts import get_object_or_404, redirect, render, reverse
 from django.urls import reverse_lazy
 from django.views.generic import (
@@ -13,40 +11,35 @@ from django.views.generic import (
     ListView,
     UpdateView,
 )
+from mutadi.db.replicas import read_from_replica
+from mutadi.images.mixins import DeferredImageMixin
+from mutadi.pages.cache import cache_anonymous_page
+from mutadi.pagination import CursorPaginationMixin, get_cursor_page
 
 from .forms import CommentForm, EditForm, PostForm
-from .models import Post
+from .models import Comment, Post
+from .sidebar import get_sidebar_context
 
+COMMENT_KEYS = ("-timestamp", "-pk")
 
-def get_category_count():
-    """
-    Queryset to find post according titles of categories
-    and count of posts in a category.
-    """
-    queryset = Post.objects.values("categories__title").annotate(
-        Count("categories__title")
-    )
-    return queryset
 
-
-class PostListView(ListView):
+class PostListView(CursorPaginationMixin, ListView):
     """Post list view."""
 
     template_name = "post_list.html"
-    queryset = Post.objects.all()
+    queryset = Post.objects.published().for_listing()
     paginate_by = 4
-    ordering = ["-created_on"]
+    ordering = ["-created_on", "-pk"]
 
     def get_context_data(self, **kwargs):
-        category_count = get_category_count()
-        latest_posts = Post.objects.order_by("-created_on")[:3]
         context = super().get_context_data(**kwargs)
-        context["category_count"] = category_count
-        context["latest_posts"] = latest_posts
+        context.update(get_sidebar_context())
         return context
 
 
-post_list_view = PostListView.as_view()
+post_list_view = cache_anonymous_page("listings", "sidebar")(
+    read_from_replica(PostListView.as_view())
+)
 
 
 class PostDetailView(DetailView):
@@ -57,13 +50,18 @@ class PostDetailView(DetailView):
     context_object_name = "post"
     form_class = CommentForm
 
+    comments_per_page = 10
+
     def get_context_data(self, **kwargs):
-        category_count = get_category_count()
-        latest_posts = Post.objects.order_by("-created_on")[:3]
         context = super().get_context_data(**kwargs)
-        context["latest_posts"] = latest_posts
-        context["category_count"] = category_count
+        context.update(get_sidebar_context())
         context["form"] = self.form_class
+        context["comment_page"] = get_cursor_page(
+            self.request,
+            self.object.get_comments,
+            self.comments_per_page,
+            COMMENT_KEYS,
+        )
         return context
 
     def post(self, request, pk, *args, **kwargs):
@@ -76,16 +74,43 @@ class PostDetailView(DetailView):
             return redirect(reverse("post_detail", kwargs={"pk": post.pk}))
 
 
-post_detail_view = PostDetailView.as_view()
+post_detail_view = cache_anonymous_page("post-{pk}", "sidebar")(
+    read_from_replica(PostDetailView.as_view())
+)
+
+
+class PostCommentsView(CursorPaginationMixin, ListView):
+    """Next comments of a post, as a fragment of the post detail page."""
 
+    template_name = "comment_list.html"
+    paginate_by = PostDetailView.comments_per_page
+    cursor_keys = COMMENT_KEYS
+
+    def get_queryset(self):
+        return Comment.objects.filter(
+            post_id=self.kwargs["pk"]
+        ).select_related("user__profile")
 
-class AddPostView(LoginRequiredMixin, SuccessMessageMixin, CreateView):
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["comment_page"] = context["page_obj"]
+        context["post_pk"] = self.kwargs["pk"]
+        return context
+
+
+post_comments_view = PostCommentsView.as_view()
+
+
+class AddPostView(
+    LoginRequiredMixin, SuccessMessageMixin, DeferredImageMixin, CreateView
+):
     """Add post view"""
 
     model = Post
     form_class = PostForm
     template_name = "add_post.html"
     success_message = "La publication a été créée avec succès !"
+    image_fields = ("thumbnail",)
 
     def form_valid(self, form):
         form.instance.author = self.request.user
@@ -95,13 +120,14 @@ class AddPostView(LoginRequiredMixin, SuccessMessageMixin, CreateView):
 add_post_view = AddPostView.as_view()
 
 
-class UpdatePostView(SuccessMessageMixin, UpdateView):
+class UpdatePostView(SuccessMessageMixin, DeferredImageMixin, UpdateView):
     """Update post view"""
 
     model = Post
     form_class = EditForm
     template_name = "update_post.html"
     success_message = "La publication a été mise à jour avec succès !"
+    image_fields = ("thumbnail",)
 
 
 update_post_view = UpdatePostView.as_view()
@@ -123,14 +149,18 @@ class DeletePostView(SuccessMessageMixin, DeleteView):
 delete_post_view = DeletePostView.as_view()
 
 
+@cache_anonymous_page("listings", "sidebar")
+@read_from_replica
 def category_view(request, cats):
     """Display posts of caegories dselected by users."""
-    category_posts = Post.objects.filter(categories__title=cats).order_by(
-        "created_on"
+    category_posts = (
+        Post.objects.published()
+        .for_listing()
+        .filter(categories__title=cats)
+    )
+    page_obj = get_cursor_page(
+        request, category_posts, 4, ("created_on", "pk")
     )
-    paginator = Paginator(category_posts, 4)
-    page_number = request.GET.get("page")
-    page_obj = paginator.get_page(page_number)
     return render(
         request,
         "categories.html",
@@ -150,22 +180,14 @@ class SearchResultsView(ListView):
     paginate_by = 4
 
     def get_queryset(self):
-        """Retrieving specific objects with icontains filters
+        """Retrieving specific objects matching the search query
         Returns:
-            list: objects by products name
+            list: posts ranked by relevance
         """
         query = self.request.GET.get("q")
-        if query:
-            object_list = (
-                Post.objects.filter(
-                    Q(title__icontains=query)
-                    | Q(overview__icontains=query)
-                    | Q(categories__title__icontains=query)
-                )
-                .distinct()
-                .order_by("-created_on")
-            )
-        return object_list
-
-
-search_results_view = SearchResultsView.as_view()
+        if not query:
+            return Post.objects.none()
+        return Post.objects.published().for_listing().search(query)
+
+
+search_results_view = read_from_replica(SearchResultsView.as_view())
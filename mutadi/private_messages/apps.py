@@ -1,5 +1,13 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
 
 
 class MessagesConfig(AppConfig):
     name = "mutadi.private_messages"
+
+    def ready(self):
+        from .models import PrivateMessage
+        from .unread import invalidate_unread_count
+
+        post_save.connect(invalidate_unread_count, sender=PrivateMessage)
+        post_delete.connect(invalidate_unread_count, sender=PrivateMessage)
@@ -0,0 +1,9 @@
+"""Private messages context processors"""
+from .unread import get_unread_count
+
+
+def unread_messages(request):
+    """Adds the unread messages count of the user, shown by the navbar."""
+    if not request.user.is_authenticated:
+        return {}
+    return {"unread_messages_count": get_unread_count(request.user)}
@@ -1,8 +1,49 @@
 """Private messages forms configuration"""
 from django import forms
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.urls import reverse_lazy
 
 from .models import PrivateMessage
 
+User = get_user_model()
+
+
+class RecipientInput(forms.TextInput):
+    """
+    Text input suggesting members from the recipient autocomplete
+    endpoint instead of rendering every member as a select option.
+    """
+
+    class Media:
+        js = ("js/recipient_autocomplete.js",)
+
+    def __init__(self, attrs=None):
+        super().__init__(
+            {
+                "class": "form-control",
+                "autocomplete": "off",
+                "data-autocomplete-url": reverse_lazy(
+                    "recipient_autocomplete"
+                ),
+                **(attrs or {}),
+            }
+        )
+
+
+class RecipientField(forms.ModelChoiceField):
+    """Member chosen by username, loading only that member."""
+
+    widget = RecipientInput
+    default_error_messages = {
+        "invalid_choice": "Ce membre n'existe pas.",
+    }
+
+    def __init__(self, **kwargs):
+        kwargs["queryset"] = User.objects.filter(is_active=True)
+        kwargs["to_field_name"] = "username"
+        super().__init__(**kwargs)
+
 
 class ComposeForm(forms.ModelForm):
     """Compose message form."""
@@ -14,9 +55,9 @@ class ComposeForm(forms.ModelForm):
             "recipient",
             "content",
         )
+        field_classes = {"recipient": RecipientField}
         widgets = {
             "subject": forms.TextInput(attrs={"class": "form-control"}),
-            "recipient": forms.Select(attrs={"class": "form-control"}),
             "content": forms.Textarea(attrs={"class": "form-control"}),
         }
         labels = {
@@ -37,3 +78,24 @@ class ReplyForm(forms.ModelForm):
             "content": forms.Textarea(attrs={"class": "form-control"}),
         }
         labels = {"subject": "Sujet", "content": "Contenu"}
+
+
+class MessageIdsField(forms.Field):
+    """List of message ids from the checkboxes of a mailbox."""
+
+    widget = forms.MultipleHiddenInput
+
+    def to_python(self, value):
+        try:
+            return [int(pk) for pk in value or []]
+        except (TypeError, ValueError):
+            raise ValidationError("Sélection invalide.")
+
+
+class BulkMessageForm(forms.Form):
+    """Action applied to the messages selected in a mailbox."""
+
+    action = forms.ChoiceField(
+        choices=(("delete", "Supprimer"), ("read", "Marquer comme lu"))
+    )
+    message_ids = MessageIdsField()
@@ -0,0 +1,74 @@
+"""Private messages purge_messages command"""
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from mutadi.private_messages.models import PrivateMessage, Thread
+
+
+class Command(BaseCommand):
+    """
+    Remove for good the messages deleted by both users for longer than
+    the retention window, by batches of primary keys so that each
+    transaction stays short, then the conversations left empty.
+    """
+
+    help = "Purge the messages deleted by both their sender and recipient."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.PRIVATE_MESSAGES_RETENTION_DAYS,
+            help="Days a message deleted by both users is kept.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of messages removed per transaction.",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0.0,
+            help="Seconds to wait between two batches.",
+        )
+
+    def handle(self, *args, **options):
+        before = timezone.now() - timedelta(days=options["days"])
+        messages = PrivateMessage.objects.purgeable(before).order_by("pk")
+        last_pk = 0
+        purged = 0
+        elapsed = 0.0
+        while True:
+            started = time.monotonic()
+            batch = list(
+                messages.filter(pk__gt=last_pk).values_list(
+                    "pk", "thread_id"
+                )[: options["batch_size"]]
+            )
+            if not batch:
+                break
+            pks, thread_ids = zip(*batch)
+            with transaction.atomic():
+                deleted, _ = PrivateMessage.objects.filter(
+                    pk__in=pks
+                ).delete()
+                Thread.objects.filter(
+                    pk__in=set(thread_ids), messages__isnull=True
+                ).delete()
+            purged += deleted
+            elapsed += time.monotonic() - started
+            last_pk = pks[-1]
+            if options["sleep"]:
+                time.sleep(options["sleep"])
+        rate = purged / elapsed if elapsed else 0
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{purged} message(s) purged ({rate:.0f} rows/s)."
+            )
+        )
@@ -0,0 +1,21 @@
+# Generated by Django 3.2.20 on 2026-10-18 12:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('private_messages', '0005_auto_20201230_1643'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='privatemessage',
+            index=models.Index(condition=models.Q(('recipient_deleted_at__isnull', True)), fields=['recipient', '-sent_at', '-id'], name='privatemessage_inbox_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='privatemessage',
+            index=models.Index(condition=models.Q(('sender_deleted_at__isnull', True)), fields=['sender', '-sent_at', '-id'], name='privatemessage_outbox_idx'),
+        ),
+    ]
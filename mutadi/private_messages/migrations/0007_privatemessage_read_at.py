@@ -0,0 +1,29 @@
+# Generated by Django 3.2.20 on 2026-10-18 12:27
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def mark_existing_read(apps, schema_editor):
+    PrivateMessage = apps.get_model('private_messages', 'PrivateMessage')
+    PrivateMessage.objects.update(read_at=F('sent_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('private_messages', '0006_auto_20261018_1413'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='privatemessage',
+            name='read_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(mark_existing_read, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='privatemessage',
+            index=models.Index(condition=models.Q(('read_at__isnull', True), ('recipient_deleted_at__isnull', True)), fields=['recipient'], name='privatemessage_unread_idx'),
+        ),
+    ]
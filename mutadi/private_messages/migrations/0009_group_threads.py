@@ -0,0 +1,46 @@
+import re
+
+from django.db import migrations
+
+REPLY_PREFIX = re.compile(r'^\s*((re|tr|fw|fwd)\s*:\s*)+', re.IGNORECASE)
+
+
+def group_threads(apps, schema_editor):
+    """
+    File existing messages in conversations: messages between the same
+    two users whose subjects match once their reply prefixes are removed,
+    each message replying to the previous one.
+    """
+    PrivateMessage = apps.get_model('private_messages', 'PrivateMessage')
+    Thread = apps.get_model('private_messages', 'Thread')
+    last_messages = {}
+    for message in PrivateMessage.objects.filter(
+        thread__isnull=True
+    ).order_by('sent_at', 'pk').iterator():
+        subject = REPLY_PREFIX.sub('', message.subject).strip()
+        participants = tuple(
+            sorted((message.sender_id, message.recipient_id))
+        )
+        key = (participants, subject.lower())
+        previous = last_messages.get(key)
+        if previous is None:
+            message.thread = Thread.objects.create(
+                subject=subject or message.subject,
+                created_at=message.sent_at,
+            )
+        else:
+            message.thread_id = previous.thread_id
+            message.parent_id = previous.pk
+        message.save(update_fields=['thread', 'parent'])
+        last_messages[key] = message
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('private_messages', '0008_thread'),
+    ]
+
+    operations = [
+        migrations.RunPython(group_threads, migrations.RunPython.noop),
+    ]
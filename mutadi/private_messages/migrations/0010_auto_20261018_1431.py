@@ -0,0 +1,23 @@
+# Generated by Django 3.2.20 on 2026-10-18 12:31
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('private_messages', '0009_group_threads'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='privatemessage',
+            name='thread',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='messages', to='private_messages.thread'),
+        ),
+        migrations.AddIndex(
+            model_name='privatemessage',
+            index=models.Index(fields=['thread', 'sent_at', 'id'], name='privatemessage_thread_idx'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+from django.conf import settings
+from django.db import migrations
+
+SEARCH_COLUMNS = ('username', 'first_name', 'last_name')
+
+
+def get_user_table(apps):
+    return apps.get_model(settings.AUTH_USER_MODEL)._meta.db_table
+
+
+def create_search_indexes(apps, schema_editor):
+    """
+    Prefix indexes matching the UPPER(column::text) LIKE 'TERM%' queries
+    of istartswith lookups, used by the recipient autocomplete.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    table = get_user_table(apps)
+    for column in SEARCH_COLUMNS:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {table}_{column}_prefix_idx '
+            f'ON {table} (UPPER({column}::text) text_pattern_ops)'
+        )
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    table = get_user_table(apps)
+    for column in SEARCH_COLUMNS:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {table}_{column}_prefix_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('private_messages', '0010_auto_20261018_1431'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
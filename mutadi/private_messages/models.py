@@ -1,13 +1,100 @@
 """Private messages models configuration"""
 from ckeditor.fields import RichTextField
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Q
 from django.urls import reverse
 from django.utils import timezone
 
 User = get_user_model()
 
 
+class Thread(models.Model):
+    """A conversation grouping a message and its replies."""
+
+    subject = models.CharField(max_length=150)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return self.subject
+
+    def get_absolute_url(self):
+        """Return to the conversation page."""
+        return reverse("thread", args=[self.pk])
+
+
+class PrivateMessageQuerySet(models.QuerySet):
+    """Custom queryset for private messages."""
+
+    def inbox(self, user):
+        """inbox returns messages received and kept by user."""
+        return self.filter(
+            recipient=user, recipient_deleted_at__isnull=True
+        ).order_by("-sent_at", "-pk")
+
+    def outbox(self, user):
+        """outbox returns messages sent and kept by user."""
+        return self.filter(
+            sender=user, sender_deleted_at__isnull=True
+        ).order_by("-sent_at", "-pk")
+
+    def in_thread(self, thread_id, user):
+        """
+        in_thread returns the messages of a conversation kept by user,
+        oldest first, with their sender and recipient.
+        """
+        return (
+            self.filter(thread_id=thread_id)
+            .filter(
+                Q(sender=user, sender_deleted_at__isnull=True)
+                | Q(recipient=user, recipient_deleted_at__isnull=True)
+            )
+            .select_related("sender", "recipient")
+            .order_by("sent_at", "pk")
+        )
+
+    def unread(self, user):
+        """unread returns messages received and not opened yet by user."""
+        return self.filter(
+            recipient=user,
+            recipient_deleted_at__isnull=True,
+            read_at__isnull=True,
+        )
+
+    def purgeable(self, before):
+        """
+        purgeable returns messages deleted by both sender and recipient
+        before the given date, which no mailbox can show anymore.
+        """
+        return self.filter(
+            sender_deleted_at__lt=before, recipient_deleted_at__lt=before
+        )
+
+    def delete_for(self, user):
+        """
+        delete_for marks the messages as deleted on the sides of user,
+        with one UPDATE per side, and returns the number of messages
+        removed from the mailboxes of user.
+        """
+        now = timezone.now()
+        received = self.filter(
+            recipient=user, recipient_deleted_at__isnull=True
+        ).update(recipient_deleted_at=now)
+        sent = self.filter(
+            sender=user, sender_deleted_at__isnull=True
+        ).update(sender_deleted_at=now)
+        return received + sent
+
+    def mark_read_for(self, user):
+        """
+        mark_read_for marks the messages received by user as read,
+        with one UPDATE, and returns the number of messages marked.
+        """
+        return self.filter(recipient=user, read_at__isnull=True).update(
+            read_at=timezone.now()
+        )
+
+
 class PrivateMessage(models.Model):
     """A private message from user to user."""
 
@@ -22,6 +109,47 @@ class PrivateMessage(models.Model):
     content = RichTextField()
     sender_deleted_at = models.DateTimeField(null=True, blank=True)
     recipient_deleted_at = models.DateTimeField(null=True, blank=True)
+    read_at = models.DateTimeField(null=True, blank=True)
+    thread = models.ForeignKey(
+        Thread,
+        related_name="messages",
+        on_delete=models.CASCADE,
+        db_index=False,
+    )
+    parent = models.ForeignKey(
+        "self",
+        related_name="replies",
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+    )
+
+    objects = PrivateMessageQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["recipient", "-sent_at", "-id"],
+                condition=models.Q(recipient_deleted_at__isnull=True),
+                name="privatemessage_inbox_idx",
+            ),
+            models.Index(
+                fields=["sender", "-sent_at", "-id"],
+                condition=models.Q(sender_deleted_at__isnull=True),
+                name="privatemessage_outbox_idx",
+            ),
+            models.Index(
+                fields=["recipient"],
+                condition=models.Q(
+                    recipient_deleted_at__isnull=True, read_at__isnull=True
+                ),
+                name="privatemessage_unread_idx",
+            ),
+            models.Index(
+                fields=["thread", "sent_at", "id"],
+                name="privatemessage_thread_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.sender} to {self.recipient} : {self.content}"
@@ -29,3 +157,22 @@ class PrivateMessage(models.Model):
     def get_absolute_url(self):
         """Return to homepage."""
         return reverse("inbox")
+
+    def save(self, *args, **kwargs):
+        """
+        save files a new message in the conversation of its parent,
+        or opens a new conversation.
+        """
+        with transaction.atomic():
+            if self.thread_id is None:
+                if self.parent_id is not None:
+                    self.thread_id = self.parent.thread_id
+                else:
+                    self.thread = Thread.objects.create(subject=self.subject)
+            super().save(*args, **kwargs)
+
+    def mark_read(self):
+        """mark_read records the first opening of the message."""
+        if self.read_at is None:
+            self.read_at = timezone.now()
+            self.save(update_fields=["read_at"])
@@ -0,0 +1,70 @@
+"""Unit tests for private_messages app management commands"""
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.utils import timezone
+from model_bakery import baker
+from mutadi.private_messages.models import PrivateMessage, Thread
+
+pytestmark = pytest.mark.django_db
+
+User = get_user_model()
+
+
+class TestPurgeMessagesCommand:
+    """Group multiple tests in purge_messages command."""
+
+    @pytest.fixture
+    def proto_users(self):
+        """Fixture for baked User models."""
+        return baker.make(User, _quantity=2)
+
+    def make_message(self, proto_users, days=None, parent=None):
+        """Returns a message deleted by both users days ago, if given."""
+        deleted_at = None
+        if days is not None:
+            deleted_at = timezone.now() - timedelta(days=days)
+        return PrivateMessage.objects.create(
+            subject="Sujet",
+            sender=proto_users[0],
+            recipient=proto_users[1],
+            content="Ullamco nisi ex.",
+            parent=parent,
+            sender_deleted_at=deleted_at,
+            recipient_deleted_at=deleted_at,
+        )
+
+    def test_purge_old_messages_by_batches(self, proto_users):
+        """Command should remove every expired message across batches."""
+        for _ in range(5):
+            self.make_message(proto_users, days=40)
+        kept = self.make_message(proto_users, days=10)
+        out = StringIO()
+        call_command("purge_messages", batch_size=2, stdout=out)
+        assert "5 message(s) purged" in out.getvalue()
+        assert "rows/s" in out.getvalue()
+        assert list(PrivateMessage.objects.all()) == [kept]
+        assert list(Thread.objects.all()) == [kept.thread]
+
+    def test_purge_keeps_messages_of_one_mailbox(self, proto_users):
+        """Messages still kept by one user should never be purged."""
+        message = self.make_message(proto_users)
+        PrivateMessage.objects.filter(pk=message.pk).update(
+            sender_deleted_at=timezone.now() - timedelta(days=40)
+        )
+        out = StringIO()
+        call_command("purge_messages", days=0, stdout=out)
+        assert "0 message(s) purged" in out.getvalue()
+        assert PrivateMessage.objects.exists()
+
+    def test_purge_keeps_replies_and_their_thread(self, proto_users):
+        """Replies of a purged message should stay in their conversation."""
+        message = self.make_message(proto_users, days=40)
+        reply = self.make_message(proto_users, parent=message)
+        call_command("purge_messages", stdout=StringIO())
+        reply.refresh_from_db()
+        assert reply.parent is None
+        assert reply.thread == message.thread
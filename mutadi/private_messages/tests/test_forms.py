@@ -88,6 +88,34 @@ class TestComposeForm:
         assert len(form.errors) == 1
         assert "content" in form.errors
 
+    def test_recipient_loaded_by_username(
+        self, django_assert_num_queries, proto_user_b
+    ):
+        """Recipient should be validated by loading that member only."""
+        form = ComposeForm(
+            {
+                "subject": "This is the subject",
+                "recipient": proto_user_b.username,
+                "content": "Culpa est et aliquip.",
+            }
+        )
+        with django_assert_num_queries(2):
+            # field lookup, then foreign key check of the model
+            assert form.is_valid()
+        assert form.cleaned_data["recipient"] == proto_user_b
+
+    def test_invalid_compose_message_form_with_unknown_recipient(self):
+        """Compose message form should be refused for an unknown member."""
+        form = ComposeForm(
+            {
+                "subject": "This is the subject",
+                "recipient": "nobody",
+                "content": "Culpa est et aliquip.",
+            }
+        )
+        assert not form.is_valid()
+        assert form.errors["recipient"] == ["Ce membre n'existe pas."]
+
 
 class TestReplyForm:
     """Group multiple tests for ReplyForm"""
@@ -0,0 +1,66 @@
+"""Unit tests for the request-scoped identity map"""
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.test import RequestFactory
+from model_bakery import baker
+from mutadi.identity import IdentityMap, get_identity_map
+
+pytestmark = pytest.mark.django_db
+
+User = get_user_model()
+
+
+class TestIdentityMap:
+    """Group multiple tests in IdentityMap."""
+
+    def test_instance_loaded_once(self, django_assert_num_queries):
+        """An instance should be loaded on first access only."""
+        user = baker.make(User)
+        identity_map = IdentityMap()
+        with django_assert_num_queries(1):
+            assert identity_map.get(User, user.pk) == user
+            assert identity_map.get(User, str(user.pk)) is identity_map.get(
+                User.objects.all(), user.pk
+            )
+
+    def test_missing_instance(self, django_assert_num_queries):
+        """Missing or invalid primary keys should return None."""
+        identity_map = IdentityMap()
+        with django_assert_num_queries(1):
+            assert identity_map.get(User, 0) is None
+            assert identity_map.get(User, 0) is None
+            assert identity_map.get(User, "abc") is None
+
+    def test_filtered_queryset_applied(self, django_assert_num_queries):
+        """Remembered instances should still pass filtered querysets."""
+        active, inactive = baker.make(User, _quantity=2)
+        inactive.is_active = False
+        inactive.save()
+        identity_map = IdentityMap()
+        identity_map.add(active, inactive)
+        active_users = User.objects.filter(is_active=True)
+        with django_assert_num_queries(2):
+            assert identity_map.get(active_users, active.pk) is active
+            assert identity_map.get(active_users, inactive.pk) is None
+        assert identity_map.get(User, inactive.pk) is inactive
+
+    def test_filtered_out_instance_not_remembered(self):
+        """An instance filtered out should not be taken as missing."""
+        user = baker.make(User, is_active=False)
+        identity_map = IdentityMap()
+        active_users = User.objects.filter(is_active=True)
+        assert identity_map.get(active_users, user.pk) is None
+        assert identity_map.get(User, user.pk) == user
+
+    def test_request_map_knows_user(self, django_assert_num_queries):
+        """The map of a request should start with its user."""
+        request = RequestFactory().get("/")
+        request.user = baker.make(User)
+        identity_map = get_identity_map(request)
+        with django_assert_num_queries(0):
+            assert identity_map.get(User, request.user.pk) is request.user
+        assert get_identity_map(request) is identity_map
+        request = RequestFactory().get("/")
+        request.user = AnonymousUser()
+        assert get_identity_map(request).get(User, 1) is None
@@ -2,6 +2,7 @@
 """
 import pytest
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 from model_bakery import baker
 from mutadi.private_messages.models import PrivateMessage
 
@@ -70,3 +71,121 @@ class TestPrivateMessageModel:
     def test_get_absolute_url(self, proto_private_message):
         """get_absolute_url() should be redirected to home page."""
         assert proto_private_message.get_absolute_url() == "/messages/inbox/"
+
+    def test_inbox_excludes_deleted_messages(
+        self, proto_private_message, proto_user
+    ):
+        """inbox should only return messages kept by the recipient."""
+        baker.make(
+            PrivateMessage,
+            sender=proto_user[0],
+            recipient=proto_user[1],
+            content="Ullamco nisi ex.",
+            recipient_deleted_at=timezone.now(),
+        )
+        assert list(PrivateMessage.objects.inbox(proto_user[1])) == [
+            proto_private_message
+        ]
+
+    def test_outbox_excludes_deleted_messages(
+        self, proto_private_message, proto_user
+    ):
+        """outbox should only return messages kept by the sender."""
+        baker.make(
+            PrivateMessage,
+            sender=proto_user[0],
+            recipient=proto_user[2],
+            content="Ullamco nisi ex.",
+            sender_deleted_at=timezone.now(),
+        )
+        assert list(PrivateMessage.objects.outbox(proto_user[0])) == [
+            proto_private_message
+        ]
+
+    def test_delete_for_marks_sides_of_user(
+        self, proto_private_message, proto_user
+    ):
+        """delete_for should only delete messages on the sides of user."""
+        reply = baker.make(
+            PrivateMessage,
+            sender=proto_user[1],
+            recipient=proto_user[0],
+            content="Ullamco nisi ex.",
+        )
+        messages = PrivateMessage.objects.filter(
+            pk__in=[proto_private_message.pk, reply.pk]
+        )
+        assert messages.delete_for(proto_user[2]) == 0
+        assert messages.delete_for(proto_user[1]) == 2
+        assert not PrivateMessage.objects.inbox(proto_user[1]).exists()
+        assert not PrivateMessage.objects.outbox(proto_user[1]).exists()
+        assert PrivateMessage.objects.inbox(proto_user[0]).get() == reply
+
+    def test_mark_read_for_recipient_only(
+        self, proto_private_message, proto_user
+    ):
+        """mark_read_for should only mark messages received by user."""
+        messages = PrivateMessage.objects.all()
+        assert messages.mark_read_for(proto_user[0]) == 0
+        assert messages.mark_read_for(proto_user[1]) == 1
+        assert messages.mark_read_for(proto_user[1]) == 0
+        proto_private_message.refresh_from_db()
+        assert proto_private_message.read_at is not None
+
+
+class TestThreadModel:
+    """Group multiple tests in Thread model"""
+
+    @pytest.fixture
+    def proto_user(self):
+        """Fixture for baked User model."""
+        return baker.make(User, _quantity=2)
+
+    @pytest.fixture
+    def proto_thread(self, proto_user):
+        """Fixture for a message and its reply."""
+        message = PrivateMessage.objects.create(
+            subject="Bonjour",
+            sender=proto_user[0],
+            recipient=proto_user[1],
+            content="Ullamco nisi ex.",
+        )
+        reply = PrivateMessage.objects.create(
+            subject="Re: Bonjour",
+            sender=proto_user[1],
+            recipient=proto_user[0],
+            content="Dolor sit amet.",
+            parent=message,
+        )
+        return message, reply
+
+    def test_new_message_opens_thread(self, proto_thread):
+        """A message without parent should open a conversation."""
+        message, _ = proto_thread
+        assert str(message.thread) == "Bonjour"
+        assert message.thread.get_absolute_url() == (
+            f"/messages/thread/{message.thread_id}"
+        )
+
+    def test_reply_joins_parent_thread(self, proto_thread):
+        """A reply should be filed in the conversation of its parent."""
+        message, reply = proto_thread
+        assert reply.thread_id == message.thread_id
+        assert list(message.replies.all()) == [reply]
+
+    def test_in_thread_excludes_deleted_messages(
+        self, proto_thread, proto_user
+    ):
+        """in_thread should return the messages kept by user, oldest first."""
+        message, reply = proto_thread
+        assert list(
+            PrivateMessage.objects.in_thread(message.thread_id, proto_user[0])
+        ) == [message, reply]
+        reply.recipient_deleted_at = timezone.now()
+        reply.save()
+        assert list(
+            PrivateMessage.objects.in_thread(message.thread_id, proto_user[0])
+        ) == [message]
+        assert list(
+            PrivateMessage.objects.in_thread(message.thread_id, proto_user[1])
+        ) == [message, reply]
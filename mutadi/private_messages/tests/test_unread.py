@@ -0,0 +1,92 @@
+"""Unit tests for private_messages app unread counter"""
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from model_bakery import baker
+from mutadi.private_messages.models import PrivateMessage
+from mutadi.private_messages.unread import get_unread_count
+
+pytestmark = pytest.mark.django_db
+
+User = get_user_model()
+
+
+class TestUnreadCount:
+    """Group multiple tests in unread messages counter."""
+
+    @pytest.fixture
+    def proto_users(self):
+        """Fixture for baked User models."""
+        return baker.make(User, _quantity=2)
+
+    @pytest.fixture
+    def proto_messages(self, proto_users):
+        """Fixture for baked PrivateMessage models sent to the 2nd user."""
+        return baker.make(
+            PrivateMessage,
+            sender=proto_users[0],
+            recipient=proto_users[1],
+            content="Ullamco nisi ex.",
+            _quantity=3,
+        )
+
+    def test_unread_count_cached(
+        self, django_assert_num_queries, proto_users, proto_messages
+    ):
+        """Counter should be computed once then served from cache."""
+        assert get_unread_count(proto_users[1]) == 3
+        with django_assert_num_queries(0):
+            assert get_unread_count(proto_users[1]) == 3
+        assert get_unread_count(proto_users[0]) == 0
+
+    def test_unread_count_updated_on_send(self, proto_users, proto_messages):
+        """Counter should grow when a message is received."""
+        get_unread_count(proto_users[1])
+        baker.make(
+            PrivateMessage,
+            sender=proto_users[0],
+            recipient=proto_users[1],
+            content="Ullamco nisi ex.",
+        )
+        assert get_unread_count(proto_users[1]) == 4
+
+    def test_message_read_by_recipient(
+        self, client, proto_users, proto_messages
+    ):
+        """Opening a message should mark it read for its recipient only."""
+        message = proto_messages[0]
+        client.force_login(proto_users[0])
+        client.get(reverse("message_detail", args=[message.pk]))
+        message.refresh_from_db()
+        assert message.read_at is None
+        client.force_login(proto_users[1])
+        client.get(reverse("message_detail", args=[message.pk]))
+        message.refresh_from_db()
+        assert message.read_at is not None
+        assert get_unread_count(proto_users[1]) == 2
+
+    def test_unread_count_updated_on_delete(
+        self, client, proto_users, proto_messages
+    ):
+        """Counter should drop messages deleted by the recipient."""
+        get_unread_count(proto_users[1])
+        client.force_login(proto_users[1])
+        client.get(reverse("delete_message", args=[proto_messages[0].pk]))
+        assert get_unread_count(proto_users[1]) == 2
+
+    def test_navbar_badge_without_messages_query(
+        self, client, proto_users, proto_messages
+    ):
+        """Every page should show the badge, cached after the first one."""
+        client.force_login(proto_users[1])
+        client.get(reverse("home"))
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(reverse("home"))
+        assert response.context["unread_messages_count"] == 3
+        assert b"badge-danger" in response.content
+        assert not any(
+            "private_messages_privatemessage" in query["sql"]
+            for query in context.captured_queries
+        )
@@ -2,20 +2,17 @@
 """
 import pytest
 from django.contrib.auth import get_user_model
-from django.test import RequestFactory
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from model_bakery import baker
 from mutadi.private_messages.models import PrivateMessage
 from pytest_django.asserts import assertTemplateUsed
 
-from mutadi.private_messages.views import compose_message_view
-
 pytestmark = pytest.mark.django_db
 
 User = get_user_model()
 
-factory = RequestFactory()
-
 
 class TestInboxViews:
     """Group multiple tests in Inbox views"""
@@ -134,6 +131,22 @@ class TestInboxViews:
         assert "is_paginated" in response.context
         assert (len(response.context["page_obj"])) == 25
 
+    def test_inbox_next_page_with_cursor(
+        self, client, proto_private_message, proto_user_b
+    ):
+        """Inbox next cursor should lead to the oldest message."""
+        client.login(
+            username=f"{proto_user_b.username}",
+            password="3$0aF/gxFsinR'6k",
+        )
+        response = client.get(reverse("inbox"))
+        cursor = response.context["page_obj"].next_cursor
+        response = client.get(reverse("inbox"), {"after": cursor})
+        page_obj = response.context["page_obj"]
+        assert list(page_obj) == [proto_private_message[0]]
+        assert page_obj.has_previous()
+        assert not page_obj.has_next()
+
 
 class TestOutboxViews:
     """Group multiple tests in Outbox views"""
@@ -588,9 +601,315 @@ class TestMessageDetailViews:
                     "mollit exercitation cillum et."
                 ),
             }
-            user = proto_user_a
-            request = factory.post("/messages/compose/", data=data)
-            request.user = user
-            response = compose_message_view(request)
-            assert response
+            response = client.post(reverse("compose_message"), data=data)
+            assert response.status_code == 302
+            assert response.url == reverse("inbox")
+            assert PrivateMessage.objects.get(
+                sender=proto_user_a
+            ).recipient == proto_user_b
+
+
+class TestThreadViews:
+    """Group multiple tests in Thread views"""
+
+    @pytest.fixture
+    def proto_users(self):
+        """Fixture for baked User models."""
+        return baker.make(User, _quantity=3)
+
+    @pytest.fixture
+    def proto_message(self, proto_users):
+        """Fixture for a message with replies."""
+        message = PrivateMessage.objects.create(
+            sender=proto_users[0],
+            recipient=proto_users[1],
+            subject="Bonjour",
+            content="Ullamco nisi ex.",
+        )
+        for index in range(3):
+            message = PrivateMessage.objects.create(
+                sender=message.recipient,
+                recipient=message.sender,
+                subject="Re: Bonjour",
+                content=f"Réponse {index}",
+                parent=message,
+            )
+        return message
+
+    def test_reply_does_not_copy_previous_message(
+        self, client, proto_users, proto_message
+    ):
+        """Reply should join the thread without quoting the message."""
+        client.force_login(proto_message.recipient)
+        url = reverse("message_detail", args=[proto_message.pk])
+        response = client.get(url)
+        assert response.context["form"].initial == {"subject": "Re: Bonjour"}
+        client.post(url, {"subject": "Re: Bonjour", "content": "Merci !"})
+        reply = PrivateMessage.objects.latest("pk")
+        assert reply.content == "Merci !"
+        assert reply.parent == proto_message
+        assert reply.thread_id == proto_message.thread_id
+
+    def test_thread_in_one_query(
+        self, client, django_assert_num_queries, proto_users, proto_message
+    ):
+        """Thread page should fetch the whole conversation at once."""
+        client.force_login(proto_users[0])
+        url = reverse("thread", args=[proto_message.thread_id])
+        client.get(url)
+        with django_assert_num_queries(4):
+            # session, user, conversation, navbar profile
+            response = client.get(url)
+        assert response.status_code == 200
+        assert len(response.context["thread_messages"]) == 4
+        assert response.context["subject"] == "Bonjour"
+        assertTemplateUsed(response, "thread.html")
+
+    def test_thread_hidden_from_other_users(
+        self, client, proto_users, proto_message
+    ):
+        """Thread page should not exist for users outside of it."""
+        client.force_login(proto_users[2])
+        response = client.get(reverse("thread", args=[proto_message.thread_id]))
+        assert response.status_code == 404
+
+
+class TestBulkMessageViews:
+    """Group multiple tests in bulk mailbox views"""
+
+    @pytest.fixture
+    def proto_users(self):
+        """Fixture for baked User models."""
+        return baker.make(User, _quantity=3)
+
+    @pytest.fixture
+    def proto_messages(self, proto_users):
+        """Fixture for messages between the first two users."""
+        received = baker.make(
+            PrivateMessage,
+            sender=proto_users[0],
+            recipient=proto_users[1],
+            content="Ullamco nisi ex.",
+            _quantity=3,
+        )
+        sent = baker.make(
+            PrivateMessage,
+            sender=proto_users[1],
+            recipient=proto_users[0],
+            content="Ullamco nisi ex.",
+            _quantity=2,
+        )
+        return received, sent
+
+    def test_bulk_delete_in_one_update_per_side(
+        self, client, proto_users, proto_messages
+    ):
+        """Selected messages should be deleted on the sides of the user."""
+        received, sent = proto_messages
+        client.force_login(proto_users[1])
+        ids = [message.pk for message in received[:2] + sent[:1]]
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(
+                reverse("bulk_messages"),
+                {"action": "delete", "message_ids": ids, "next": "/x/"},
+            )
+        assert [
+            query["sql"].split(" SET ")[0]
+            for query in context.captured_queries
+            if "private_messages_privatemessage" in query["sql"]
+        ] == ['UPDATE "private_messages_privatemessage"'] * 2
+        assert response.url == "/x/"
+        assert list(PrivateMessage.objects.inbox(proto_users[1])) == [
+            received[2]
+        ]
+        assert list(PrivateMessage.objects.outbox(proto_users[1])) == [sent[1]]
+        assert PrivateMessage.objects.inbox(proto_users[0]).count() == 2
+
+    def test_bulk_delete_ignores_messages_of_others(
+        self, client, proto_users, proto_messages
+    ):
+        """Messages of other users should not be touched."""
+        received, _ = proto_messages
+        client.force_login(proto_users[2])
+        client.post(
+            reverse("bulk_messages"),
+            {"action": "delete", "message_ids": [received[0].pk]},
+        )
+        assert PrivateMessage.objects.inbox(proto_users[1]).count() == 3
+
+    def test_bulk_mark_read(self, client, proto_users, proto_messages):
+        """Selected messages should be marked read and the badge updated."""
+        received, _ = proto_messages
+        client.force_login(proto_users[1])
+        assert client.get(reverse("inbox")).context[
+            "unread_messages_count"
+        ] == 3
+        response = client.post(
+            reverse("bulk_messages"),
+            {"action": "read", "message_ids": [received[0].pk]},
+        )
+        assert response.url == reverse("inbox")
+        assert client.get(reverse("inbox")).context[
+            "unread_messages_count"
+        ] == 2
+
+    def test_bulk_without_selection(self, client, proto_users):
+        """Bulk action without message should be refused."""
+        client.force_login(proto_users[1])
+        response = client.post(
+            reverse("bulk_messages"), {"action": "delete"}, follow=True
+        )
+        assert b"Aucun message s\xc3\xa9lectionn\xc3\xa9." in response.content
+
+    def test_bulk_requires_post(self, client, proto_users):
+        """Bulk endpoint should not change anything on GET."""
+        client.force_login(proto_users[1])
+        assert client.get(reverse("bulk_messages")).status_code == 405
+
+    def test_empty_inbox(self, client, proto_users, proto_messages):
+        """Empty inbox should delete every received message only."""
+        client.force_login(proto_users[1])
+        response = client.post(reverse("empty_inbox"))
+        assert response.url == reverse("inbox")
+        assert not PrivateMessage.objects.inbox(proto_users[1]).exists()
+        assert PrivateMessage.objects.outbox(proto_users[1]).count() == 2
+
+    def test_empty_outbox(self, client, proto_users, proto_messages):
+        """Empty outbox should delete every sent message only."""
+        client.force_login(proto_users[1])
+        client.post(reverse("empty_outbox"))
+        assert not PrivateMessage.objects.outbox(proto_users[1]).exists()
+        assert PrivateMessage.objects.inbox(proto_users[1]).count() == 3
+
+
+class TestRecipientAutocompleteViews:
+    """Group multiple tests in recipient autocomplete view"""
+
+    @pytest.fixture
+    def proto_users(self):
+        """Fixture for baked User models with searchable names."""
+        return [
+            baker.make(User, username="alice", first_name="Alice"),
+            baker.make(User, username="bob", last_name="Alibert"),
+            baker.make(User, username="carol", first_name="Carole"),
+            baker.make(User, username="alain", is_active=False),
+        ]
+
+    def search(self, client, term):
+        """Returns the usernames suggested for term."""
+        response = client.get(
+            reverse("recipient_autocomplete"), {"q": term}
+        )
+        assert response.status_code == 200
+        return [member["username"] for member in response.json()["results"]]
+
+    def test_prefix_search_on_names(self, client, proto_users):
+        """Active members should match on username, first or last name."""
+        client.force_login(proto_users[2])
+        assert self.search(client, "AL") == ["alice", "bob"]
+        assert self.search(client, "car") == []
+
+    def test_short_term_not_searched(
+        self, client, django_assert_num_queries, proto_users
+    ):
+        """Terms shorter than two characters should not query users."""
+        client.force_login(proto_users[2])
+        client.get(reverse("home"))
+        with django_assert_num_queries(2):
+            # session, user
+            assert self.search(client, "a") == []
+
+    def test_anonymous_user_redirected(self, client, proto_users):
+        """Members should not be listed to anonymous users."""
+        response = client.get(reverse("recipient_autocomplete"), {"q": "al"})
+        assert response.status_code == 302
+
+    def test_compose_page_without_members_list(self, client, proto_users):
+        """Compose page should not render every member anymore."""
+        client.force_login(proto_users[0])
+        response = client.get(reverse("compose_message"))
+        assert b"<option" not in response.content
+        assert b"js/recipient_autocomplete.js" in response.content
+        assert b'data-autocomplete-url="/messages/compose_message/' in (
+            response.content
+        )
+
+    def test_compose_page_with_initial_recipient(self, client, proto_users):
+        """Compose page should fill in the recipient given in the url."""
+        client.force_login(proto_users[0])
+        response = client.get(
+            reverse("compose_message"), {"destinataire": proto_users[1].pk}
+        )
+        assert b'value="bob"' in response.content
+
+
+class TestMessageDetailQueries:
+    """Group multiple tests in queries of the message detail views"""
+
+    @pytest.fixture
+    def proto_message(self):
+        """Fixture for a message between two baked users."""
+        users = baker.make(User, _quantity=2)
+        return PrivateMessage.objects.create(
+            subject="Sujet",
+            sender=users[0],
+            recipient=users[1],
+            content="Ullamco nisi ex.",
+        )
+
+    def test_detail_page_queries(
+        self, client, django_assert_num_queries, proto_message
+    ):
+        """Detail page should load the message and its users at once."""
+        client.force_login(proto_message.recipient)
+        url = reverse("message_detail", args=[proto_message.pk])
+        client.get(url)
+        with django_assert_num_queries(4):
+            # session, user, message with its users, navbar profile
+            response = client.get(url)
+        assert response.status_code == 200
+        assert str(proto_message.sender).encode() in response.content
+
+    def test_reply_without_reloading_users(self, client, proto_message):
+        """Reply should reuse the sender loaded with the message."""
+        client.force_login(proto_message.recipient)
+        url = reverse("message_detail", args=[proto_message.pk])
+        with CaptureQueriesContext(connection) as context:
+            client.post(url, {"subject": "Re: Sujet", "content": "Merci."})
+        users_queries = [
+            query
+            for query in context.captured_queries
+            if 'FROM "auth_user"' in query["sql"]
+        ]
+        # the logged in user only
+        assert len(users_queries) == 1
+        reply = PrivateMessage.objects.get(parent=proto_message)
+        assert reply.recipient == proto_message.sender
+
+    def test_unknown_message_not_found(self, client, proto_message):
+        """Detail page of a missing message should be a 404."""
+        client.force_login(proto_message.recipient)
+        response = client.get(reverse("message_detail", args=[0]))
+        assert response.status_code == 404
+
+    def test_message_of_others_not_found(self, client, proto_message):
+        """Other users should neither read a message nor reply to it."""
+        client.force_login(baker.make(User))
+        url = reverse("message_detail", args=[proto_message.pk])
+        assert client.get(url).status_code == 404
+        response = client.post(
+            url, {"subject": "Re: Sujet", "content": "Coucou."}
+        )
+        assert response.status_code == 404
+        assert not PrivateMessage.objects.filter(parent=proto_message).exists()
+        proto_message.refresh_from_db()
+        assert proto_message.read_at is None
+
+    def test_compose_to_invalid_recipient(self, client, proto_message):
+        """Compose page should ignore a missing or invalid recipient."""
+        client.force_login(proto_message.sender)
+        for recipient in ("0", "abc"):
+            response = client.get(
+                reverse("compose_message"), {"destinataire": recipient}
+            )
             assert response.status_code == 200
@@ -0,0 +1,33 @@
+"""Private messages unread counter"""
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+
+from .models import PrivateMessage
+
+UNREAD_CACHE_KEY = "private_messages:unread:{}"
+UNREAD_CACHE_TIMEOUT = 60 * 60
+
+
+def get_unread_count(user):
+    """
+    Returns the number of unread messages of user. The count is kept
+    in the cache until a message sent to user is saved or deleted, so
+    it is counted on the primary database rather than on a replica.
+    """
+    key = UNREAD_CACHE_KEY.format(user.pk)
+    count = cache.get(key)
+    if count is None:
+        messages = PrivateMessage.objects.using(DEFAULT_DB_ALIAS)
+        count = messages.unread(user).count()
+        cache.set(key, count, UNREAD_CACHE_TIMEOUT)
+    return count
+
+
+def reset_unread_count(user):
+    """Drop the cached counter of user after a bulk update."""
+    cache.delete(UNREAD_CACHE_KEY.format(user.pk))
+
+
+def invalidate_unread_count(sender, **kwargs):
+    """Drop the cached counter of the recipient of a changed message."""
+    cache.delete(UNREAD_CACHE_KEY.format(kwargs["instance"].recipient_id))
@@ -2,16 +2,33 @@
 from django.urls import path
 
 from .views import (
+    bulk_messages,
     compose_message_view,
     delete_message,
+    empty_mailbox,
     inbox_view,
     message_detail_view,
     outbox_view,
+    recipient_autocomplete,
+    thread_view,
 )
 
 urlpatterns = [
     path("inbox/", inbox_view, name="inbox"),
     path("outbox/", outbox_view, name="outbox"),
+    path("bulk/", bulk_messages, name="bulk_messages"),
+    path(
+        "inbox/empty/",
+        empty_mailbox,
+        {"mailbox": "inbox"},
+        name="empty_inbox",
+    ),
+    path(
+        "outbox/empty/",
+        empty_mailbox,
+        {"mailbox": "outbox"},
+        name="empty_outbox",
+    ),
     path(
         "message_detail/<int:pk>/delete",
         delete_message,
@@ -22,9 +39,15 @@ urlpatterns = [
         message_detail_view,
         name="message_detail",
     ),
+    path("thread/<int:pk>", thread_view, name="thread"),
     path(
         "compose_message/",
         compose_message_view,
         name="compose_message",
     ),
+    path(
+        "compose_message/recipients/",
+        recipient_autocomplete,
+        name="recipient_autocomplete",
+    ),
 ]
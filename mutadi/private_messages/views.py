@@ -3,19 +3,31 @@ from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.messages.views import SuccessMessageMixin
-from django.shortcuts import get_object_or_404, render
+from django.db.models import Q
+from django.http import Http404, JsonResponse
+from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse, reverse_lazy
 from django.utils import timezone
+from django.utils.functional import cached_property
+from django.utils.http import url_has_allowed_host_and_scheme
+from django.views.decorators.http import require_GET, require_POST
 from django.views.generic import CreateView, ListView
 from django.contrib.auth import get_user_model
+from mutadi.db.replicas import read_from_replica
+from mutadi.identity import get_identity_map
+from mutadi.pagination import CursorPaginationMixin
 
-from .forms import ComposeForm, ReplyForm
+from .forms import BulkMessageForm, ComposeForm, ReplyForm
 from .models import PrivateMessage
+from .unread import reset_unread_count
 
 User = get_user_model()
 
+RECIPIENT_MIN_LENGTH = 2
+RECIPIENT_RESULTS = 10
 
-class InboxView(LoginRequiredMixin, ListView):
+
+class InboxView(LoginRequiredMixin, CursorPaginationMixin, ListView):
     """
     Returns all messages that were received
     by the given user.
@@ -23,12 +35,10 @@ class InboxView(LoginRequiredMixin, ListView):
 
     template_name = "inbox.html"
     paginate_by = 25
+    cursor_keys = ("-sent_at", "-pk")
 
     def get_queryset(self):
-        self.message_list = PrivateMessage.objects.filter(
-            recipient=self.request.user,
-            recipient_deleted_at__isnull=True,
-        ).order_by("-sent_at")
+        self.message_list = PrivateMessage.objects.inbox(self.request.user)
         return self.message_list
 
     def get_context_data(self, **kwargs):
@@ -37,10 +47,10 @@ class InboxView(LoginRequiredMixin, ListView):
         return context
 
 
-inbox_view = InboxView.as_view()
+inbox_view = read_from_replica(InboxView.as_view())
 
 
-class OutboxView(LoginRequiredMixin, ListView):
+class OutboxView(LoginRequiredMixin, CursorPaginationMixin, ListView):
     """
     Returns all messages that were sent
     by the given user.
@@ -48,12 +58,10 @@ class OutboxView(LoginRequiredMixin, ListView):
 
     template_name = "outbox.html"
     paginate_by = 25
+    cursor_keys = ("-sent_at", "-pk")
 
     def get_queryset(self):
-        self.message_list = PrivateMessage.objects.filter(
-            sender=self.request.user,
-            sender_deleted_at__isnull=True,
-        ).order_by("-sent_at")
+        self.message_list = PrivateMessage.objects.outbox(self.request.user)
         return self.message_list
 
     def get_context_data(self, **kwargs):
@@ -62,7 +70,7 @@ class OutboxView(LoginRequiredMixin, ListView):
         return context
 
 
-outbox_view = OutboxView.as_view()
+outbox_view = read_from_replica(OutboxView.as_view())
 
 
 @login_required(login_url="/members/login/")
@@ -70,7 +78,7 @@ def delete_message(request, pk, success_url=None):
     """
     Marks a message as deleted by sender or recipient. The message is not
     really removed from the database, because two users must delete a message
-    before it's save to remove it completely.
+    before it's save to remove it completely, which purge_messages does.
     """
     user = request.user
     now = timezone.now()
@@ -78,10 +86,10 @@ def delete_message(request, pk, success_url=None):
     deleted = False
     if success_url is None:
         success_url = reverse("inbox")
-    if message.sender == user:
+    if message.sender_id == user.pk:
         message.sender_deleted_at = now
         deleted = True
-    if message.recipient == user:
+    if message.recipient_id == user.pk:
         message.recipient_deleted_at = now
         deleted = True
     if deleted:
@@ -90,6 +98,64 @@ def delete_message(request, pk, success_url=None):
     return render(request, "inbox.html", {"deleted": deleted})
 
 
+def get_mailbox_url(request):
+    """Mailbox to go back to after a bulk action."""
+    next_url = request.POST.get("next")
+    if next_url and url_has_allowed_host_and_scheme(
+        next_url,
+        allowed_hosts={request.get_host()},
+        require_https=request.is_secure(),
+    ):
+        return next_url
+    return reverse("inbox")
+
+
+@login_required(login_url="/members/login/")
+@require_POST
+def bulk_messages(request):
+    """
+    Deletes or marks as read the messages selected in a mailbox,
+    with one UPDATE per side whatever their number.
+    """
+    form = BulkMessageForm(request.POST)
+    if form.is_valid():
+        selected = PrivateMessage.objects.filter(
+            pk__in=form.cleaned_data["message_ids"]
+        )
+        if form.cleaned_data["action"] == "delete":
+            count = selected.delete_for(request.user)
+            messages.warning(
+                request, f"{count} message(s) supprimé(s) avec succès !"
+            )
+        else:
+            count = selected.mark_read_for(request.user)
+            messages.success(
+                request, f"{count} message(s) marqué(s) comme lu(s) !"
+            )
+        reset_unread_count(request.user)
+    else:
+        messages.error(request, "Aucun message sélectionné.")
+    return redirect(get_mailbox_url(request))
+
+
+@login_required(login_url="/members/login/")
+@require_POST
+def empty_mailbox(request, mailbox):
+    """Marks every message of the inbox or the outbox as deleted."""
+    now = timezone.now()
+    if mailbox == "inbox":
+        count = PrivateMessage.objects.inbox(request.user).update(
+            recipient_deleted_at=now
+        )
+        reset_unread_count(request.user)
+    else:
+        count = PrivateMessage.objects.outbox(request.user).update(
+            sender_deleted_at=now
+        )
+    messages.warning(request, f"{count} message(s) supprimé(s) avec succès !")
+    return redirect(mailbox)
+
+
 class MessageDetailView(LoginRequiredMixin, SuccessMessageMixin, CreateView):
     """Message detail view and processing reply."""
 
@@ -98,19 +164,40 @@ class MessageDetailView(LoginRequiredMixin, SuccessMessageMixin, CreateView):
     form_class = ReplyForm
     success_message = "La réponse a été envoyé avec succès !"
 
-    def dispatch(self, request, pk, *args, **kwargs):
-        self.message = PrivateMessage.objects.get(pk=pk)
-        return super().dispatch(request, *args, **kwargs)
+    @cached_property
+    def message(self):
+        """
+        The message of the page, with its sender and recipient, who are
+        the only users allowed to read it and reply to it.
+        """
+        identity_map = get_identity_map(self.request)
+        message = identity_map.get(
+            PrivateMessage.objects.select_related("sender", "recipient"),
+            self.kwargs["pk"],
+        )
+        if message is None or self.request.user.pk not in (
+            message.sender_id,
+            message.recipient_id,
+        ):
+            raise Http404("Ce message n'existe pas.")
+        identity_map.add(message.sender, message.recipient)
+        return message
+
+    def get(self, request, *args, **kwargs):
+        if self.message.recipient_id == request.user.pk:
+            self.message.mark_read()
+        return super().get(request, *args, **kwargs)
 
     def get_initial(self):
-        return {
-            "subject": f"Re: {self.message.subject}",
-            "content": f"-- {self.message.sender} : {self.message.content}",
-        }
+        subject = self.message.subject
+        if not subject.startswith("Re: "):
+            subject = f"Re: {subject}"
+        return {"subject": subject}
 
     def form_valid(self, form):
         form.instance.sender = self.request.user
         form.instance.recipient = self.message.sender
+        form.instance.parent = self.message
         return super().form_valid(form)
 
     def get_context_data(self):
@@ -122,6 +209,68 @@ class MessageDetailView(LoginRequiredMixin, SuccessMessageMixin, CreateView):
 message_detail_view = MessageDetailView.as_view()
 
 
+class ThreadView(LoginRequiredMixin, ListView):
+    """Messages of a conversation kept by the user, oldest first."""
+
+    template_name = "thread.html"
+    context_object_name = "thread_messages"
+    allow_empty = False
+
+    def get_queryset(self):
+        return PrivateMessage.objects.in_thread(
+            self.kwargs["pk"], self.request.user
+        )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        thread_messages = context["thread_messages"]
+        context["subject"] = thread_messages[0].subject
+        received = [
+            message
+            for message in thread_messages
+            if message.recipient_id == self.request.user.pk
+        ]
+        context["last_received"] = received[-1] if received else None
+        return context
+
+
+thread_view = ThreadView.as_view()
+
+
+@login_required(login_url="/members/login/")
+@require_GET
+def recipient_autocomplete(request):
+    """
+    Returns as JSON the first active members whose username, first name
+    or last name starts with the q parameter, served by the prefix
+    indexes of the users table.
+    """
+    term = request.GET.get("q", "").strip()
+    results = []
+    if len(term) >= RECIPIENT_MIN_LENGTH:
+        members = (
+            User.objects.filter(
+                Q(username__istartswith=term)
+                | Q(first_name__istartswith=term)
+                | Q(last_name__istartswith=term),
+                is_active=True,
+            )
+            .exclude(pk=request.user.pk)
+            .order_by("username")
+            .values_list("username", "first_name", "last_name")
+        )
+        results = [
+            {
+                "username": username,
+                "name": f"{first_name} {last_name}".strip(),
+            }
+            for username, first_name, last_name in members[
+                :RECIPIENT_RESULTS
+            ]
+        ]
+    return JsonResponse({"results": results})
+
+
 class ComposeMessageView(LoginRequiredMixin, SuccessMessageMixin, CreateView):
     """Compose message view."""
 
@@ -138,8 +287,9 @@ class ComposeMessageView(LoginRequiredMixin, SuccessMessageMixin, CreateView):
     def get_initial(self):
         initial = super().get_initial()
         if self.request.GET.get("destinataire"):
-            user = User.objects.get(pk=self.request.GET.get("destinataire"))
-            initial["recipient"] = user
+            initial["recipient"] = get_identity_map(self.request).get(
+                User, self.request.GET["destinataire"]
+            )
         return initial
 
 
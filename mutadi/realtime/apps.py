@@ -0,0 +1,14 @@
+from django.apps import AppConfig
+from django.db.models.signals import post_save
+
+
+class RealtimeConfig(AppConfig):
+    name = "mutadi.realtime"
+
+    def ready(self):
+        from .events import notify_new_comment, notify_new_message
+
+        post_save.connect(
+            notify_new_message, sender="private_messages.PrivateMessage"
+        )
+        post_save.connect(notify_new_comment, sender="posts.Comment")
@@ -0,0 +1,174 @@
+"""ASGI application streaming the realtime events as server-sent events"""
+import asyncio
+import json
+import re
+from importlib import import_module
+from io import BytesIO
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib import auth
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections, connection
+
+from .events import user_group
+from .layers import get_channel_layer
+from .listener import post_group, start_listener
+
+EVENTS_PATH = "/realtime/events/"
+KEEPALIVE = 15
+RETRY = 5000
+
+
+@sync_to_async
+def get_user(scope):
+    """Logged in user of the session cookie sent with scope."""
+    close_old_connections()
+    try:
+        request = ASGIRequest(scope, BytesIO())
+        engine = import_module(settings.SESSION_ENGINE)
+        request.session = engine.SessionStore(
+            request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+        )
+        return auth.get_user(request)
+    finally:
+        close_old_connections()
+
+
+def format_event(event):
+    """Encode event in the text/event-stream format."""
+    data = json.dumps(event, cls=DjangoJSONEncoder)
+    return f"event: {event['type']}\ndata: {data}\n\n".encode()
+
+
+async def send_response(send, status, body):
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"text/plain; charset=utf-8")],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+async def wait_disconnect(receive):
+    while (await receive())["type"] != "http.disconnect":
+        pass
+
+
+async def stream_events(receive, send, *groups):
+    """
+    stream_events is a function to stream the events of groups to the
+    client until it disconnects, with a comment line every KEEPALIVE
+    seconds so that proxies keep the connection open.
+    """
+    with get_channel_layer().subscribe(*groups) as subscription:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", b"text/event-stream"),
+                    (b"cache-control", b"no-cache"),
+                    (b"x-accel-buffering", b"no"),
+                ],
+            }
+        )
+        await send(
+            {
+                "type": "http.response.body",
+                "body": f"retry: {RETRY}\n\n".encode(),
+                "more_body": True,
+            }
+        )
+        disconnected = asyncio.ensure_future(wait_disconnect(receive))
+        try:
+            while True:
+                event = asyncio.ensure_future(subscription.get())
+                done, _ = await asyncio.wait(
+                    {event, disconnected},
+                    timeout=KEEPALIVE,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if disconnected in done:
+                    event.cancel()
+                    break
+                if event in done:
+                    body = format_event(event.result())
+                else:
+                    event.cancel()
+                    body = b": keepalive\n\n"
+                await send(
+                    {
+                        "type": "http.response.body",
+                        "body": body,
+                        "more_body": True,
+                    }
+                )
+        finally:
+            disconnected.cancel()
+
+
+async def user_events(scope, receive, send):
+    """Stream the events of the logged in user."""
+    if scope["method"] != "GET":
+        await send_response(send, 405, b"Method not allowed")
+        return
+    user = await get_user(scope)
+    if not user.is_authenticated:
+        # any status but 200 stops the reconnections of EventSource
+        await send_response(send, 403, b"Forbidden")
+        return
+    if connection.vendor == "postgresql":
+        start_listener()
+    await stream_events(receive, send, user_group(user.pk))
+
+
+@sync_to_async
+def post_exists(pk):
+    from mutadi.posts.models import Post
+
+    close_old_connections()
+    try:
+        return Post.objects.filter(pk=pk).exists()
+    finally:
+        close_old_connections()
+
+
+async def post_comments(scope, receive, send, pk):
+    """Stream the new comments of a post to its viewers."""
+    if scope["method"] != "GET":
+        await send_response(send, 405, b"Method not allowed")
+        return
+    if not await post_exists(int(pk)):
+        await send_response(send, 404, b"Not found")
+        return
+    if connection.vendor == "postgresql":
+        start_listener()
+    await stream_events(receive, send, post_group(pk))
+
+
+class RealtimeRouter:
+    """
+    ASGI application serving the realtime events streams itself and
+    every other request with the django application.
+    """
+
+    routes = [
+        (re.compile(f"^{EVENTS_PATH}$"), user_events),
+        (re.compile(r"^/realtime/posts/(?P<pk>\d+)/comments/$"), post_comments),
+    ]
+
+    def __init__(self, application):
+        self.application = application
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            for pattern, stream in self.routes:
+                match = pattern.match(scope["path"])
+                if match:
+                    await stream(scope, receive, send, **match.groupdict())
+                    return
+        await self.application(scope, receive, send)
@@ -0,0 +1,70 @@
+"""Realtime events sent on new messages and comments"""
+from django.db import connection, transaction
+from django.urls import reverse
+
+from .layers import get_channel_layer
+from .listener import notify_comment, notify_event, send_comment
+
+
+def user_group(user_id):
+    """Group of the events sent to a member."""
+    return f"user-{user_id}"
+
+
+def publish(group, event):
+    """
+    publish is a function to send event to group once the current
+    transaction is committed, so that clients never see rolled back rows.
+    With PostgreSQL, the event goes through the database to reach the
+    clients of every process.
+    """
+    if connection.vendor == "postgresql":
+        notify_event(group, event)
+    else:
+        transaction.on_commit(
+            lambda: get_channel_layer().group_send(group, event)
+        )
+
+
+def notify_new_message(sender, instance, created, raw=False, **kwargs):
+    """Tell the recipient of a new private message."""
+    if not created or raw:
+        return
+    publish(
+        user_group(instance.recipient_id),
+        {
+            "type": "message",
+            "id": instance.pk,
+            "subject": instance.subject,
+            "sender": instance.sender.username,
+            "url": reverse("message_detail", args=[instance.pk]),
+        },
+    )
+
+
+def notify_new_comment(sender, instance, created, raw=False, **kwargs):
+    """
+    Stream a new comment to the viewers of its post, and tell the author
+    of the post about the comments of other members.
+    """
+    if not created or raw:
+        return
+    if connection.vendor == "postgresql":
+        notify_comment(instance)
+    else:
+        post_id, comment_id = instance.post_id, instance.pk
+        transaction.on_commit(lambda: send_comment(post_id, comment_id))
+    post = instance.post
+    if post.author_id == instance.user_id:
+        return
+    publish(
+        user_group(post.author_id),
+        {
+            "type": "comment",
+            "id": instance.pk,
+            "post": post.pk,
+            "title": post.title,
+            "user": instance.user.username,
+            "url": reverse("post_detail", args=[post.pk]),
+        },
+    )
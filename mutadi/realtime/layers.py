@@ -0,0 +1,99 @@
+"""Channel layers delivering the realtime events"""
+import asyncio
+import threading
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+_layer = None
+
+
+class Subscription:
+    """Events of some groups waiting to be streamed to one client."""
+
+    def __init__(self, layer, groups, capacity):
+        self.layer = layer
+        self.groups = groups
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(capacity)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.layer.unsubscribe(self)
+
+    def put(self, event):
+        """Queue event, dropping the oldest one of a slow client."""
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(event)
+
+    async def get(self):
+        return await self.queue.get()
+
+
+class InMemoryChannelLayer:
+    """
+    Channel layer delivering events to the subscribers of the current
+    process only, the listener of mutadi.realtime.listener relaying the
+    events sent by other processes. Events are sent from any thread and
+    handed over to the event loop of each subscriber.
+    """
+
+    def __init__(self, capacity=100):
+        self.capacity = capacity
+        self._groups = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, *groups):
+        """Returns a subscription to groups, from an event loop."""
+        subscription = Subscription(self, groups, self.capacity)
+        with self._lock:
+            for group in groups:
+                self._groups.setdefault(group, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            for group in subscription.groups:
+                subscriptions = self._groups.get(group, set())
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    self._groups.pop(group, None)
+
+    def group_send(self, group, event):
+        """Send event to every subscriber of group."""
+        with self._lock:
+            subscriptions = list(self._groups.get(group, ()))
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(
+                    subscription.put, event
+                )
+            except RuntimeError:
+                # the event loop of the subscriber is closed
+                self.unsubscribe(subscription)
+
+    def group_size(self, group):
+        """Number of subscribers of group."""
+        with self._lock:
+            return len(self._groups.get(group, ()))
+
+
+def get_channel_layer():
+    """Channel layer configured by settings.CHANNEL_LAYERS."""
+    global _layer
+    if _layer is None:
+        config = settings.CHANNEL_LAYERS["default"]
+        _layer = import_string(config["BACKEND"])(**config.get("CONFIG", {}))
+    return _layer
+
+
+@receiver(setting_changed)
+def reset_channel_layer(setting, **kwargs):
+    global _layer
+    if setting == "CHANNEL_LAYERS":
+        _layer = None
@@ -0,0 +1,159 @@
+"""Database listener relaying the realtime events of every process"""
+import json
+import logging
+import select
+import threading
+
+import psycopg2
+from django.db import close_old_connections, connection, connections
+from django.template.loader import render_to_string
+
+from .layers import get_channel_layer
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "mutadi_comments"
+EVENTS_CHANNEL = "mutadi_events"
+POLL_TIMEOUT = 1
+RECONNECT_DELAY = 5
+
+_listener = None
+_listener_lock = threading.Lock()
+
+
+def post_group(post_id):
+    """Group of the viewers of a post."""
+    return f"post-{post_id}"
+
+
+def notify_comment(comment):
+    """
+    notify_comment is a function to tell the listeners of every process
+    about a new comment. PostgreSQL delivers the notification when the
+    current transaction commits, and drops it on rollback.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT pg_notify(%s, %s)",
+            [CHANNEL, f"{comment.post_id}:{comment.pk}"],
+        )
+
+
+def notify_event(group, event):
+    """
+    notify_event is a function to send event to the subscribers of group
+    in every process, once the current transaction commits.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT pg_notify(%s, %s)",
+            [EVENTS_CHANNEL, json.dumps({"group": group, "event": event})],
+        )
+
+
+def send_comment(post_id, comment_id):
+    """
+    send_comment is a function to render a comment once and send it to
+    the viewers of its post in this process, if any.
+    """
+    from mutadi.posts.models import Comment
+
+    layer = get_channel_layer()
+    group = post_group(post_id)
+    if not layer.group_size(group):
+        return
+    comment = (
+        Comment.objects.select_related("user__profile")
+        .filter(pk=comment_id)
+        .first()
+    )
+    if comment is not None:
+        layer.group_send(
+            group,
+            {
+                "type": "comment",
+                "id": comment.pk,
+                "html": render_to_string("comment.html", {"comment": comment}),
+            },
+        )
+
+
+class EventListener(threading.Thread):
+    """
+    Thread holding the only LISTEN connection of the process, so that
+    all the clients share it instead of each polling the database, and
+    get the events sent by the other processes.
+    """
+
+    def __init__(self):
+        super().__init__(name="event-listener", daemon=True)
+        self.stopping = threading.Event()
+
+    def stop(self):
+        self.stopping.set()
+        self.join()
+
+    def run(self):
+        while not self.stopping.is_set():
+            try:
+                self.listen()
+            except psycopg2.Error:
+                logger.exception("Event listener lost its connection")
+                self.stopping.wait(RECONNECT_DELAY)
+        connections.close_all()
+
+    def listen(self):
+        params = connections["default"].get_connection_params()
+        listen_connection = psycopg2.connect(**params)
+        try:
+            listen_connection.autocommit = True
+            with listen_connection.cursor() as cursor:
+                cursor.execute(f"LISTEN {CHANNEL}")
+                cursor.execute(f"LISTEN {EVENTS_CHANNEL}")
+            while not self.stopping.is_set():
+                readable, _, _ = select.select(
+                    [listen_connection], [], [], POLL_TIMEOUT
+                )
+                if not readable:
+                    continue
+                listen_connection.poll()
+                while listen_connection.notifies:
+                    notify = listen_connection.notifies.pop(0)
+                    self.dispatch(notify.channel, notify.payload)
+        finally:
+            listen_connection.close()
+
+    def dispatch(self, channel, payload):
+        close_old_connections()
+        try:
+            if channel == EVENTS_CHANNEL:
+                data = json.loads(payload)
+                get_channel_layer().group_send(data["group"], data["event"])
+            else:
+                post_id, comment_id = (
+                    int(part) for part in payload.split(":")
+                )
+                send_comment(post_id, comment_id)
+        except Exception:
+            logger.exception("Cannot relay %s event %s", channel, payload)
+        finally:
+            close_old_connections()
+
+
+def start_listener():
+    """Start the event listener of the process, once."""
+    global _listener
+    with _listener_lock:
+        if _listener is None or not _listener.is_alive():
+            _listener = EventListener()
+            _listener.start()
+    return _listener
+
+
+def stop_listener():
+    """Stop the event listener of the process, if it runs."""
+    global _listener
+    with _listener_lock:
+        listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
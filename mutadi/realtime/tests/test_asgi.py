@@ -0,0 +1,147 @@
+"""Unit tests for realtime app ASGI application"""
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from asgiref.testing import ApplicationCommunicator
+from django.contrib.auth import get_user_model
+from model_bakery import baker
+from mutadi.posts.models import Post
+from mutadi.realtime.asgi import EVENTS_PATH, RealtimeRouter
+from mutadi.realtime.events import user_group
+from mutadi.realtime.layers import get_channel_layer
+from mutadi.realtime.listener import post_group, stop_listener
+
+# the stream closes its database connections like django's handlers do,
+# so the session lookups cannot run inside a test transaction
+pytestmark = pytest.mark.django_db(transaction=True)
+
+User = get_user_model()
+
+
+def make_scope(path=EVENTS_PATH, method="GET", cookie=""):
+    """Returns the ASGI scope of a request."""
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"testserver"), (b"cookie", cookie.encode())],
+        "client": ("127.0.0.1", 1234),
+        "server": ("testserver", 80),
+    }
+
+
+@pytest.fixture(autouse=True)
+def listener():
+    """Stop the event listener started by the streams."""
+    yield
+    stop_listener()
+
+
+async def django_application(scope, receive, send):
+    """Stand-in of the django application behind the router."""
+    await send({"type": "http.response.start", "status": 204})
+    await send({"type": "http.response.body", "body": b""})
+
+
+class TestRealtimeRouter:
+    """Group multiple tests in RealtimeRouter."""
+
+    @pytest.fixture
+    def session_cookie(self, client, settings):
+        """Fixture for the session cookie of a logged in baked User."""
+        user = baker.make(User)
+        client.force_login(user)
+        cookie = client.cookies[settings.SESSION_COOKIE_NAME].value
+        return user, f"{settings.SESSION_COOKIE_NAME}={cookie}"
+
+    def request(self, scope):
+        """Returns the response start and body of a short request."""
+
+        async def scenario():
+            communicator = ApplicationCommunicator(
+                RealtimeRouter(django_application), scope
+            )
+            await communicator.send_input({"type": "http.request"})
+            start = await communicator.receive_output(5)
+            body = await communicator.receive_output(5)
+            await communicator.wait(5)
+            return start["status"], body["body"]
+
+        return async_to_sync(scenario)()
+
+    def test_other_paths_served_by_django(self):
+        """Requests out of the events stream should reach django."""
+        assert self.request(make_scope("/")) == (204, b"")
+
+    def test_anonymous_user_forbidden(self):
+        """Events stream should refuse anonymous users."""
+        assert self.request(make_scope())[0] == 403
+
+    def test_post_not_allowed(self, session_cookie):
+        """Events stream should only answer GET requests."""
+        scope = make_scope(method="POST", cookie=session_cookie[1])
+        assert self.request(scope)[0] == 405
+
+    def test_events_streamed_to_logged_in_user(self, session_cookie):
+        """Events of the user should be streamed until disconnection."""
+        user, cookie = session_cookie
+
+        async def scenario():
+            communicator = ApplicationCommunicator(
+                RealtimeRouter(django_application), make_scope(cookie=cookie)
+            )
+            await communicator.send_input({"type": "http.request"})
+            start = await communicator.receive_output(5)
+            assert start["status"] == 200
+            assert (b"content-type", b"text/event-stream") in start["headers"]
+            assert (await communicator.receive_output(5))["body"] == (
+                b"retry: 5000\n\n"
+            )
+            get_channel_layer().group_send(
+                user_group(user.pk), {"type": "message", "id": 1}
+            )
+            event = await communicator.receive_output(5)
+            await communicator.send_input({"type": "http.disconnect"})
+            await communicator.wait(5)
+            return event["body"].decode()
+
+        body = async_to_sync(scenario)()
+        name, data = body.strip().split("\n")
+        assert name == "event: message"
+        assert json.loads(data[len("data: "):]) == {"type": "message", "id": 1}
+        assert get_channel_layer().group_size(user_group(user.pk)) == 0
+
+    def test_comments_of_missing_post_not_found(self):
+        """Comments stream of a missing post should be a 404."""
+        assert self.request(make_scope("/realtime/posts/0/comments/"))[0] == (
+            404
+        )
+
+    def test_comments_streamed_to_anonymous_viewer(self):
+        """Anyone reading a post should receive its new comments."""
+        post = baker.make(Post, content="Contenu")
+        path = f"/realtime/posts/{post.pk}/comments/"
+
+        async def scenario():
+            communicator = ApplicationCommunicator(
+                RealtimeRouter(django_application), make_scope(path)
+            )
+            await communicator.send_input({"type": "http.request"})
+            assert (await communicator.receive_output(5))["status"] == 200
+            await communicator.receive_output(5)
+            get_channel_layer().group_send(
+                post_group(post.pk), {"type": "comment", "id": 1}
+            )
+            event = await communicator.receive_output(5)
+            await communicator.send_input({"type": "http.disconnect"})
+            await communicator.wait(5)
+            return event["body"]
+
+        assert async_to_sync(scenario)().startswith(b"event: comment\n")
@@ -0,0 +1,150 @@
+"""Unit tests for realtime app events"""
+import asyncio
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from model_bakery import baker
+from mutadi.posts.models import Comment, Post
+from mutadi.private_messages.models import PrivateMessage
+from mutadi.realtime.events import user_group
+from mutadi.realtime.layers import InMemoryChannelLayer, get_channel_layer
+from mutadi.realtime.listener import (
+    notify_event,
+    start_listener,
+    stop_listener,
+)
+
+User = get_user_model()
+
+
+def collect_events(group, action):
+    """Returns the events sent to group while running action."""
+
+    async def scenario():
+        with get_channel_layer().subscribe(group) as subscription:
+            # the listener needs a moment to LISTEN after its start
+            await asyncio.sleep(0.5)
+            await sync_to_async(action)()
+            # let the listener relay the events sent through the database
+            await asyncio.sleep(0.5)
+            events = []
+            while not subscription.queue.empty():
+                events.append(subscription.queue.get_nowait())
+            return events
+
+    return async_to_sync(scenario)()
+
+
+class TestInMemoryChannelLayer:
+    """Group multiple tests in InMemoryChannelLayer."""
+
+    def test_events_delivered_to_group_only(self):
+        """Subscribers should only receive the events of their groups."""
+        layer = InMemoryChannelLayer()
+
+        async def scenario():
+            with layer.subscribe("a") as first, layer.subscribe("b") as other:
+                await sync_to_async(layer.group_send)("a", {"type": "x"})
+                assert await first.get() == {"type": "x"}
+                assert other.queue.empty()
+            assert layer.group_size("a") == 0
+
+        async_to_sync(scenario)()
+
+    def test_slow_client_keeps_latest_events(self):
+        """A full queue should drop its oldest events."""
+        layer = InMemoryChannelLayer(capacity=2)
+
+        async def scenario():
+            with layer.subscribe("a") as subscription:
+                for index in range(3):
+                    layer.group_send("a", {"type": "x", "index": index})
+                await asyncio.sleep(0)
+                return [
+                    subscription.queue.get_nowait()["index"]
+                    for _ in range(subscription.queue.qsize())
+                ]
+
+        assert async_to_sync(scenario)() == [1, 2]
+
+
+@pytest.mark.django_db(transaction=True)
+class TestRealtimeEvents:
+    """Group multiple tests in events sent on new rows."""
+
+    @pytest.fixture(autouse=True)
+    def listener(self):
+        """Fixture for the event listener, stopped after the test."""
+        yield start_listener()
+        stop_listener()
+
+    @pytest.fixture
+    def proto_users(self):
+        """Fixture for baked User models."""
+        return baker.make(User, _quantity=2)
+
+    def test_new_message_sent_to_recipient(self, proto_users):
+        """Recipient should be told about a new message once committed."""
+
+        def send_message():
+            return PrivateMessage.objects.create(
+                subject="Sujet",
+                sender=proto_users[0],
+                recipient=proto_users[1],
+                content="Ullamco nisi ex.",
+            )
+
+        events = collect_events(user_group(proto_users[1].pk), send_message)
+        message = PrivateMessage.objects.get()
+        assert events == [
+            {
+                "type": "message",
+                "id": message.pk,
+                "subject": "Sujet",
+                "sender": proto_users[0].username,
+                "url": f"/messages/message_detail/{message.pk}",
+            }
+        ]
+
+    def test_new_comment_sent_to_post_author(self, proto_users):
+        """Author should be told about comments of other members only."""
+        post = baker.make(Post, author=proto_users[0], content="Contenu")
+
+        def comment():
+            baker.make(Comment, post=post, user=proto_users[1])
+            baker.make(Comment, post=post, user=proto_users[0])
+
+        events = collect_events(user_group(proto_users[0].pk), comment)
+        assert [(event["type"], event["user"]) for event in events] == [
+            ("comment", proto_users[1].username)
+        ]
+        assert events[0]["url"] == f"/posts/post_detail/{post.pk}"
+
+    def test_rolled_back_message_not_sent(self, proto_users):
+        """Nothing should be sent when the transaction is rolled back."""
+
+        def send_message():
+            with transaction.atomic():
+                PrivateMessage.objects.create(
+                    subject="Sujet",
+                    sender=proto_users[0],
+                    recipient=proto_users[1],
+                    content="Ullamco nisi ex.",
+                )
+                transaction.set_rollback(True)
+
+        assert collect_events(user_group(proto_users[1].pk), send_message) == []
+
+    def test_event_sent_from_other_process(self, proto_users):
+        """Events sent through the database should reach local clients."""
+        group = user_group(proto_users[0].pk)
+
+        def send_event():
+            with transaction.atomic():
+                notify_event(group, {"type": "message", "id": 1})
+
+        assert collect_events(group, send_event) == [
+            {"type": "message", "id": 1}
+        ]
@@ -0,0 +1,57 @@
+"""Unit tests for realtime app event listener"""
+import asyncio
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from model_bakery import baker
+from mutadi.posts.models import Comment, Post
+from mutadi.realtime.layers import get_channel_layer
+from mutadi.realtime.listener import (
+    post_group,
+    send_comment,
+    start_listener,
+    stop_listener,
+)
+
+
+@pytest.fixture
+def listener():
+    """Fixture for the event listener, stopped after the test."""
+    yield start_listener()
+    stop_listener()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_comment_streamed_to_every_viewer(listener):
+    """A committed comment should reach every viewer of its post once."""
+    post = baker.make(Post, content="Contenu")
+
+    async def scenario():
+        layer = get_channel_layer()
+        with layer.subscribe(post_group(post.pk)) as first, layer.subscribe(
+            post_group(post.pk)
+        ) as second:
+            # the listener needs a moment to LISTEN after its start
+            await asyncio.sleep(0.5)
+            comment = await sync_to_async(baker.make)(
+                Comment, post=post, content="Premier !"
+            )
+            events = [
+                await asyncio.wait_for(subscription.get(), 5)
+                for subscription in (first, second)
+            ]
+            return comment, events
+
+    comment, events = async_to_sync(scenario)()
+    assert events[0] is events[1]
+    assert events[0]["id"] == comment.pk
+    assert f'data-comment-id="{comment.pk}"' in events[0]["html"]
+    assert "Premier !" in events[0]["html"]
+
+
+@pytest.mark.django_db
+def test_comment_without_viewers_not_loaded(django_assert_num_queries):
+    """Comments of posts nobody watches should not be loaded."""
+    comment = baker.make(Comment, post__content="Contenu")
+    with django_assert_num_queries(0):
+        send_comment(comment.post_id, comment.pk)
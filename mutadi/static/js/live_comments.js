@@ -0,0 +1,28 @@
+/*global document, window, EventSource, JSON*/
+// Shows the comments posted while the post detail page is open.
+document.addEventListener('DOMContentLoaded', function () {
+
+    'use strict';
+
+    var list = document.getElementById('comment-list');
+
+    if (!window.EventSource || !list) {
+        return;
+    }
+
+    var source = new EventSource(list.dataset.streamUrl);
+
+    source.addEventListener('comment', function (event) {
+        var comment = JSON.parse(event.data);
+        var template = document.createElement('template');
+        var counter = document.querySelector('.no-of-comments');
+        if (list.querySelector('[data-comment-id="' + comment.id + '"]')) {
+            return;
+        }
+        template.innerHTML = comment.html.trim();
+        list.insertBefore(template.content.firstChild, list.firstChild);
+        if (counter) {
+            counter.textContent = '(' + (parseInt(counter.textContent.replace(/\D/g, ''), 10) + 1) + ')';
+        }
+    });
+});
@@ -0,0 +1,32 @@
+/*global document, window, fetch*/
+// Loads the older comments of a post in place of the "more" link.
+document.addEventListener('DOMContentLoaded', function () {
+
+    'use strict';
+
+    var list = document.getElementById('comment-list');
+
+    if (!window.fetch || !list) {
+        return;
+    }
+
+    list.addEventListener('click', function (event) {
+        var link = event.target.closest('.load-comments');
+        if (!link) {
+            return;
+        }
+        event.preventDefault();
+        link.classList.add('disabled');
+        fetch(link.dataset.fragmentUrl, {credentials: 'same-origin'}).then(function (response) {
+            if (!response.ok) {
+                throw new Error(response.statusText);
+            }
+            return response.text();
+        }).then(function (html) {
+            link.insertAdjacentHTML('beforebegin', html);
+            link.remove();
+        }).catch(function () {
+            window.location = link.href;
+        });
+    });
+});
@@ -0,0 +1,58 @@
+/*global document, window, EventSource, JSON*/
+// Listens to the realtime events of the logged in member: new private
+// messages update the navbar badges, and both messages and comments on
+// the member's posts are announced above the page content.
+(function () {
+
+    'use strict';
+
+    var script = document.currentScript;
+
+    if (!window.EventSource || !script) {
+        return;
+    }
+
+    function announce(text, url) {
+        var container = document.getElementById('realtime-alerts');
+        var alert = document.createElement('div');
+        var link = document.createElement('a');
+        alert.className = 'alert alert-info';
+        link.href = url;
+        link.className = 'alert-link';
+        link.textContent = text;
+        alert.appendChild(link);
+        container.appendChild(alert);
+    }
+
+    function incrementBadges() {
+        var toggle = document.getElementById('navbarDropdownMessage');
+        var inbox = document.querySelector('a.dropdown-item[href="' + script.dataset.inboxUrl + '"]');
+        [toggle, inbox].forEach(function (link) {
+            var badge;
+            if (!link) {
+                return;
+            }
+            badge = link.querySelector('.badge');
+            if (!badge) {
+                badge = document.createElement('span');
+                badge.className = 'badge badge-pill badge-danger';
+                badge.textContent = '0';
+                link.appendChild(badge);
+            }
+            badge.textContent = parseInt(badge.textContent, 10) + 1;
+        });
+    }
+
+    var source = new EventSource(script.dataset.eventsUrl);
+
+    source.addEventListener('message', function (event) {
+        var message = JSON.parse(event.data);
+        incrementBadges();
+        announce('Nouveau message de ' + message.sender + ' : ' + message.subject, message.url);
+    });
+
+    source.addEventListener('comment', function (event) {
+        var comment = JSON.parse(event.data);
+        announce(comment.user + ' a commenté « ' + comment.title + ' »', comment.url);
+    });
+}());
@@ -0,0 +1,49 @@
+/*global document, window, fetch, encodeURIComponent*/
+// Suggests members to the recipient inputs of the compose form,
+// from the JSON autocomplete endpoint given in data-autocomplete-url.
+document.addEventListener('DOMContentLoaded', function () {
+
+    'use strict';
+
+    var MIN_LENGTH = 2;
+    var DELAY = 200;
+
+    document.querySelectorAll('input[data-autocomplete-url]').forEach(function (input) {
+        var list = document.createElement('datalist');
+        var timer = null;
+        var lastTerm = '';
+
+        list.id = input.id + '_suggestions';
+        input.setAttribute('list', list.id);
+        input.parentNode.insertBefore(list, input.nextSibling);
+
+        function suggest() {
+            var term = input.value.trim();
+            if (term.length < MIN_LENGTH || term === lastTerm) {
+                return;
+            }
+            lastTerm = term;
+            fetch(input.dataset.autocompleteUrl + '?q=' + encodeURIComponent(term), {
+                credentials: 'same-origin'
+            }).then(function (response) {
+                return response.json();
+            }).then(function (data) {
+                if (term !== lastTerm) {
+                    return;
+                }
+                list.innerHTML = '';
+                data.results.forEach(function (member) {
+                    var option = document.createElement('option');
+                    option.value = member.username;
+                    option.label = member.name;
+                    list.appendChild(option);
+                });
+            });
+        }
+
+        input.addEventListener('input', function () {
+            window.clearTimeout(timer);
+            timer = window.setTimeout(suggest, DELAY);
+        });
+    });
+});